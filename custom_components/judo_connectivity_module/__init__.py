@@ -2,18 +2,44 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
+from datetime import timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    Platform,
+)
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.loader import async_get_loaded_integration
+from homeassistant.util import dt as dt_util
 
 from .api import JudoConnectivityModuleApiClient
+from .const import (
+    CONF_ALIGNED_POLLING,
+    CONF_BURST,
+    CONF_RATE_LIMIT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    UNSUPPORTED_SAVE_DELAY,
+    UNSUPPORTED_STORAGE_VERSION,
+)
 from .coordinator import JudoConnectivityModuleDataUpdateCoordinator
 from .data import JudoConnectivityModuleData
+from .helpers import get_entry_config
+from .poll_plan import get_poll_plan
+from .services import async_setup_services
+from .statistics import StatisticsFetcher
+from .websocket_api import async_setup_websocket_api
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import JudoConnectivityModuleConfigEntry
 
@@ -22,6 +48,20 @@ PLATFORMS: list[Platform] = [
     Platform.BUTTON,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Options applied to the running client and coordinator
+TRANSPORT_OPTIONS = {CONF_HOST, CONF_USERNAME, CONF_PASSWORD}
+POLLING_OPTIONS = {CONF_SCAN_INTERVAL, CONF_ALIGNED_POLLING}
+RATE_LIMIT_OPTIONS = {CONF_RATE_LIMIT, CONF_BURST}
+
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Set up the services and websocket commands of this integration."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -29,25 +69,35 @@ async def async_setup_entry(
     entry: JudoConnectivityModuleConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
+    config = get_entry_config(entry.data, entry.options)
     client = JudoConnectivityModuleApiClient(
-        hostname=entry.data[CONF_HOST],
-        username=entry.data[CONF_USERNAME],
-        password=entry.data[CONF_PASSWORD],
+        hostname=config[CONF_HOST],
+        username=config[CONF_USERNAME],
+        password=config[CONF_PASSWORD],
         session=async_get_clientsession(hass),
+        rate_limit=config.get(CONF_RATE_LIMIT),
+        burst=config.get(CONF_BURST),
     )
+    await _async_restore_unsupported(hass, entry, client)
     coordinator = JudoConnectivityModuleDataUpdateCoordinator(
         hass=hass,
         client=client,
+        update_interval=_get_update_interval(config),
+        aligned=config.get(CONF_ALIGNED_POLLING, False),
     )
+
+    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+    await coordinator.async_config_entry_first_refresh()
+
+    statistics = _create_statistics(coordinator, client)
     entry.runtime_data = JudoConnectivityModuleData(
         client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        statistics=statistics,
+        config=config,
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
-
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
@@ -62,10 +112,106 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: JudoConnectivityModuleConfigEntry,
+) -> None:
+    """Remove what is stored for an entry."""
+    await _unsupported_store(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: JudoConnectivityModuleConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Apply changed entry data, reloading only what the change affects."""
+    runtime_data = entry.runtime_data
+    config = get_entry_config(entry.data, entry.options)
+    changed = {
+        key
+        for key in runtime_data.config.keys() | config.keys()
+        if runtime_data.config.get(key) != config.get(key)
+    }
+    if not changed:
+        return
+    if changed - TRANSPORT_OPTIONS - POLLING_OPTIONS - RATE_LIMIT_OPTIONS:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    runtime_data.config = config
+    coordinator = runtime_data.coordinator
+    coordinator.scan_interval = _get_update_interval(config)
+    coordinator.aligned = config.get(CONF_ALIGNED_POLLING, False)
+
+    if changed & TRANSPORT_OPTIONS:
+        # The connection pool, coordinator and entities stay, the client's
+        # caches are dropped as they may belong to another device
+        runtime_data.client.update_transport(
+            hostname=config[CONF_HOST],
+            username=config[CONF_USERNAME],
+            password=config[CONF_PASSWORD],
+        )
+    if changed & (TRANSPORT_OPTIONS | RATE_LIMIT_OPTIONS):
+        # A new host may already have a governor with other limits
+        runtime_data.client.configure_rate_limit(
+            config.get(CONF_RATE_LIMIT), config.get(CONF_BURST)
+        )
+
+    if CONF_HOST in changed:
+        # Another device, its type and statistics are detected again
+        previous_plan = coordinator.poll_plan
+        coordinator.poll_plan = None
+        await coordinator.async_refresh()
+        if None not in (previous_plan, coordinator.poll_plan) and (
+            coordinator.poll_plan != previous_plan
+        ):
+            # The entities depend on the device type
+            await hass.config_entries.async_reload(entry.entry_id)
+            return
+        runtime_data.statistics = _create_statistics(coordinator, runtime_data.client)
+    elif changed & TRANSPORT_OPTIONS:
+        await coordinator.async_request_refresh()
+    else:
+        # Keep the last snapshot and update status, only the next poll moves
+        coordinator.async_reschedule()
+
+
+def _create_statistics(
+    coordinator: JudoConnectivityModuleDataUpdateCoordinator,
+    client: JudoConnectivityModuleApiClient,
+) -> StatisticsFetcher:
+    """Create the statistics fetcher for the device type the coordinator detected."""
+    plan = coordinator.poll_plan or get_poll_plan(None)
+    client.configure_concurrency(plan.max_concurrent_requests)
+    # The device keeps the local time of the Home Assistant instance
+    statistics = StatisticsFetcher(
+        client,
+        plan.max_concurrent_requests,
+        time_zone=dt_util.get_time_zone(coordinator.hass.config.time_zone),
+    )
+    coordinator.statistics = statistics
+    return statistics
+
+
+def _unsupported_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the operations the device of an entry rejected."""
+    return Store(hass, UNSUPPORTED_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.unsupported")
+
+
+async def _async_restore_unsupported(
+    hass: HomeAssistant,
+    entry: JudoConnectivityModuleConfigEntry,
+    client: JudoConnectivityModuleApiClient,
+) -> None:
+    """Restore the operations the device rejected and save every change."""
+    store = _unsupported_store(hass, entry.entry_id)
+    unsupported = client.unsupported
+    unsupported.load(await store.async_load())
+    unsupported.listener = partial(
+        store.async_delay_save, unsupported.as_dict, UNSUPPORTED_SAVE_DELAY
+    )
+
+
+def _get_update_interval(config: dict) -> timedelta:
+    """Return the polling interval configured for an entry."""
+    return timedelta(seconds=config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
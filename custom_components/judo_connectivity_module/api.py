@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import importlib
-import json
 import logging
+import math
+import time
+from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -12,9 +16,25 @@ import aiohttp
 import async_timeout
 import yaml
 
+from .clock import DeviceClock
+from .governor import get_governor
+from .parameters import CommandTemplate
+from .parsing import parse_response
+from .profiler import STAGE_DECODE, STAGE_JSON_PARSE, STAGE_REQUEST
+from .request_queue import (
+    PRIORITIES,
+    PRIORITY_ROUTINE,
+    get_request_queue,
+)
+from .unsupported import UnsupportedOperations
+from .utils import encode_datetime_bytes
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from .cassette import CassetteRecorder
+    from .profiler import PollCycleProfiler
+
 LOGGER = logging.getLogger(__name__)
 
 # Load API specifications
@@ -23,9 +43,53 @@ OPERATIONS = yaml.safe_load((API_SPEC_DIR / "operations.yaml").open(encoding="ut
     "operations"
 ]
 BASE_SPEC = yaml.safe_load((API_SPEC_DIR / "base.yaml").open(encoding="utf-8"))
+OPERATIONS_BY_NAME = {operation["name"]: operation for operation in OPERATIONS}
+# Parameter encoders and validators are resolved once per operation
+COMMAND_TEMPLATES = {
+    operation["name"]: CommandTemplate(
+        operation["command"],
+        operation.get("parameters", []),
+        BASE_SPEC["parameter_patterns"],
+    )
+    for operation in OPERATIONS
+}
+
+# Request queue priority of each operation
+OPERATION_PRIORITIES = {
+    operation["name"]: PRIORITIES[operation["priority"]] for operation in OPERATIONS
+}
 
 # HTTP Status Codes
 HTTP_SUCCESS_STATUS = 200
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_BAD_REQUEST = 400
+HTTP_NOT_FOUND = 404
+# Responses for commands the device does not know or does not allow
+HTTP_UNSUPPORTED_STATUSES = frozenset({HTTP_BAD_REQUEST, HTTP_NOT_FOUND})
+
+# Device control errors are the prefix followed by a 2-byte error code
+DEVICE_CONTROL_ERRORS = BASE_SPEC["error_responses"]["device_control_errors"]
+DEVICE_ERROR_PREFIX = f"{DEVICE_CONTROL_ERRORS['error_response_prefix']:02X}"
+DEVICE_ERROR_LENGTH = len(DEVICE_ERROR_PREFIX) + 4
+DEVICE_ERRORS = {
+    error["code"]: error["description"]
+    for error in DEVICE_CONTROL_ERRORS["communication_errors"]
+}
+
+# Request rate allowed per host
+RATE_LIMIT = BASE_SPEC["rate_limit"]
+DEFAULT_RATE_LIMIT = float(RATE_LIMIT["requests_per_second"])
+DEFAULT_BURST = int(RATE_LIMIT["burst"])
+MAX_RETRIES = int(RATE_LIMIT["max_retries"])
+DEFAULT_RETRY_AFTER = float(BASE_SPEC["error_responses"][429]["retry_after"])
+
+# Requests on the wire to one host, waiting ones are sent by priority
+REQUEST_QUEUE = BASE_SPEC["request_queue"]
+DEFAULT_CONCURRENT_REQUESTS = int(REQUEST_QUEUE["concurrent_requests"])
+BULK_AGING = float(REQUEST_QUEUE["bulk_aging"])
+
+# cache_ttl value keeping a response for the lifetime of the client
+CACHE_TTL_SESSION = "session"
 
 
 class JudoConnectivityModuleApiClientError(Exception):
@@ -57,15 +121,62 @@ class JudoConnectivityModuleApiClientCommunicationError(
         super().__init__(self.message)
 
 
+class JudoConnectivityModuleApiClientUnsupportedError(
+    JudoConnectivityModuleApiClientError
+):
+    """Exception raised for commands the device rejects with HTTP 400 or 404."""
+
+    def __init__(self, command: str, status: int, message: str | None = None) -> None:
+        """Initialize the exception."""
+        self.command = command
+        self.status = status
+        super().__init__(
+            message or f"Command {command} is not supported (HTTP {status})"
+        )
+
+
+class JudoConnectivityModuleApiClientDeviceError(
+    JudoConnectivityModuleApiClientCommunicationError
+):
+    """Exception raised for device control errors, such as FF0001."""
+
+    def __init__(self, command: str, code: int) -> None:
+        """Initialize the exception."""
+        self.command = command
+        self.code = code
+        description = DEVICE_ERRORS.get(code, "Unknown device control error")
+        super().__init__(
+            f"Command {command} failed with device error {code}: {description}"
+        )
+
+
+def parse_device_error(data: Any) -> int | None:
+    """Return the code of a device control error response, None for data."""
+    if (
+        not isinstance(data, str)
+        or len(data) != DEVICE_ERROR_LENGTH
+        or not data.upper().startswith(DEVICE_ERROR_PREFIX)
+    ):
+        return None
+    try:
+        code = int(data[len(DEVICE_ERROR_PREFIX) :], 16)
+    except ValueError:
+        return None
+    # Only documented codes, a value starting with FF may be legitimate data
+    return code if code in DEVICE_ERRORS else None
+
+
 class JudoConnectivityModuleApiClient:
     """JUDO Connectivity Module API Client."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         hostname: str,
         username: str,
         password: str,
         session: aiohttp.ClientSession,
+        rate_limit: float | None = None,
+        burst: int | None = None,
     ) -> None:
         """Initialize."""
         self._hostname = hostname
@@ -73,9 +184,35 @@ class JudoConnectivityModuleApiClient:
         self._password = password
         self._session = session
 
+        # Shared with every other client talking to the same host
+        self._governor = get_governor(hostname, DEFAULT_RATE_LIMIT, DEFAULT_BURST)
+        if rate_limit is not None or burst is not None:
+            self.configure_rate_limit(rate_limit, burst)
+        self._queue = get_request_queue(
+            hostname, DEFAULT_CONCURRENT_REQUESTS, BULK_AGING
+        )
+
         # Dynamically load decoder functions from utils module
         self._decoders = self._load_decoders()
 
+        # Requests currently on the wire and recent responses, keyed by command
+        self._inflight: dict[str, asyncio.Future[dict[str, Any]]] = {}
+        # Callers waiting for each in-flight request, it is cancelled without any
+        self._waiters: dict[asyncio.Future[dict[str, Any]], int] = {}
+        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
+
+        # Device time predicted between occasional reads of the device clock
+        self.device_clock = DeviceClock()
+
+        # Operations the device rejected, never requested again until the
+        # firmware version changes
+        self.unsupported = UnsupportedOperations()
+
+        # Set while poll cycles are profiled, every stage checks it before timing
+        self.profiler: PollCycleProfiler | None = None
+        # Set while traffic is recorded to a cassette
+        self.recorder: CassetteRecorder | None = None
+
     def _load_decoders(self) -> dict[str, Callable]:
         """Dynamically load decoder functions from patterns in base.yaml."""
         utils = importlib.import_module(".utils", package=__package__)
@@ -99,14 +236,62 @@ class JudoConnectivityModuleApiClient:
                 message=f"HTTP {response.status}",
             )
 
+    @staticmethod
+    def _retry_after(response: aiohttp.ClientResponse) -> float:
+        """Return the seconds a 429 response asks to wait."""
+        try:
+            return max(0.0, float(response.headers["Retry-After"]))
+        except (KeyError, ValueError):
+            return DEFAULT_RETRY_AFTER
+
+    @staticmethod
+    def _cache_ttl(operation: dict[str, Any]) -> float:
+        """Return the cache lifetime in seconds declared for an operation."""
+        ttl = operation.get("cache_ttl", 0)
+        if ttl == CACHE_TTL_SESSION:
+            return math.inf
+        return float(ttl)
+
+    def configure_rate_limit(
+        self, rate_limit: float | None = None, burst: int | None = None
+    ) -> None:
+        """Change the request rate allowed for the host of this client."""
+        self._governor.configure(
+            rate_limit if rate_limit is not None else DEFAULT_RATE_LIMIT,
+            burst if burst is not None else DEFAULT_BURST,
+        )
+
+    def configure_concurrency(self, concurrent_requests: int) -> None:
+        """Change the number of requests on the wire to the host of this client."""
+        self._queue.configure(concurrent_requests)
+
+    def invalidate_cache(self) -> None:
+        """Drop all cached responses."""
+        self._cache.clear()
+
+    def update_transport(self, hostname: str, username: str, password: str) -> None:
+        """Talk to a different host or with different credentials."""
+        if hostname != self._hostname:
+            governor = self._governor
+            self._governor = get_governor(hostname, governor.rate, governor.burst)
+            self._queue = get_request_queue(
+                hostname, self._queue.concurrency, self._queue.aging
+            )
+        self._hostname = hostname
+        self._username = username
+        self._password = password
+        # Responses and clock readings may belong to another device now,
+        # requests still on the wire finish for their callers only
+        self._inflight.clear()
+        self.invalidate_cache()
+        self.device_clock = DeviceClock()
+        self.unsupported.clear()
+
     def __getattr__(self, name: str) -> Callable:
         """Dynamically handle API operation calls."""
         if name.startswith("async_"):
             operation_name = name[6:]  # Remove async_ prefix
-            operation = next(
-                (op for op in OPERATIONS if op["name"] == operation_name),
-                None,
-            )
+            operation = OPERATIONS_BY_NAME.get(operation_name)
             if operation:
                 return lambda **kwargs: self._async_call_operation(operation, **kwargs)
 
@@ -117,22 +302,123 @@ class JudoConnectivityModuleApiClient:
         self, operation: dict[str, Any], **params: Any
     ) -> dict[str, Any]:
         """Execute an API operation based on its specification."""
-        # Format command with parameters if needed
-        command = operation["command"]
-        if params and "{" in command:
-            command = command.format(**params)
+        # Parameters may be raw values or already encoded strings
+        command = COMMAND_TEMPLATES[operation["name"]].render(**params)
+        name = operation["name"]
+        if (status := self.unsupported.status(name)) is not None:
+            error_message = f"{self._hostname} does not support {name} (HTTP {status})"
+            raise JudoConnectivityModuleApiClientUnsupportedError(
+                command, status, error_message
+            )
+
+        try:
+            result = await self._async_dispatch_operation(operation, command)
+        except JudoConnectivityModuleApiClientUnsupportedError as exception:
+            # Without arguments a 400 means the command is not allowed, with
+            # arguments it may be the arguments that were rejected
+            if exception.status == HTTP_NOT_FOUND or not operation.get("parameters"):
+                self.unsupported.add(name, exception.status)
+            raise
+        if operation.get("firmware_version") and result.get("decoded") != "unknown":
+            self.unsupported.set_firmware(str(result["decoded"]))
+        return result
+
+    async def _async_dispatch_operation(
+        self, operation: dict[str, Any], command: str
+    ) -> dict[str, Any]:
+        """Send a command the way its operation asks for."""
+        # Commands without a response change device state and are never shared
+        if "response" not in operation:
+            return await self._async_execute_operation(operation, command)
 
-        # Make API call
-        response = await self._async_get_endpoint(command)
+        if operation.get("local_clock"):
+            return await self._async_read_device_clock(operation, command)
+
+        return await self._async_shared_request(operation, command)
+
+    async def _async_read_device_clock(
+        self, operation: dict[str, Any], command: str
+    ) -> dict[str, Any]:
+        """Return the predicted device time, reading the device only to re-sync."""
+        if not self.device_clock.needs_sync():
+            device_time = self.device_clock.now()
+            return {"data": encode_datetime_bytes(device_time), "decoded": device_time}
+
+        result = await self._async_shared_request(operation, command)
+        if isinstance(result.get("decoded"), datetime):
+            self.device_clock.sync(result["decoded"])
+        return result
+
+    async def _async_shared_request(
+        self, operation: dict[str, Any], command: str
+    ) -> dict[str, Any]:
+        """Execute a read command, sharing in-flight requests and cached results."""
+        ttl = self._cache_ttl(operation)
+        cached = self._cache.get(command)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        # Concurrent callers asking for the same command share one request
+        future = self._inflight.get(command)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._async_execute_operation(operation, command)
+            )
+            self._inflight[command] = future
+            future.add_done_callback(partial(self._finish_request, command, ttl))
+        # Shield so one caller timing out does not cancel the others
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+                # The last caller left before the response arrived
+                if not future.done():
+                    future.cancel()
+
+    def _finish_request(
+        self, command: str, ttl: float, future: asyncio.Future[dict[str, Any]]
+    ) -> None:
+        """Forget an in-flight request and cache its result."""
+        # A request to the previous host, replaced by update_transport
+        if self._inflight.get(command) is not future:
+            return
+        del self._inflight[command]
+        if future.cancelled() or future.exception() is not None or not ttl:
+            return
+        result = future.result()
+        if result.get("decoded") != "unknown":
+            self._cache[command] = (time.monotonic() + ttl, result)
+
+    async def _async_execute_operation(
+        self, operation: dict[str, Any], command: str
+    ) -> dict[str, Any]:
+        """Request a command and decode the response."""
+        response, raw = await self._async_get_endpoint(
+            command, OPERATION_PRIORITIES[operation["name"]]
+        )
 
         # Process response according to pattern
         if "response" in operation:
+            if (
+                isinstance(response, dict)
+                and (code := parse_device_error(response.get("data"))) is not None
+            ):
+                raise JudoConnectivityModuleApiClientDeviceError(command, code)
             pattern_name = operation["response"]["pattern"]
             if pattern_name in self._decoders:
                 decoder = self._decoders[pattern_name]
                 data = response.get("data", "")
+                profiler = self.profiler
+                if profiler is not None:
+                    started = time.perf_counter()
                 try:
-                    decoded_value = decoder(data)
+                    # Decoders take the payload bytes when the body carried hex
+                    decoded_value = decoder(data if raw is None else raw)
+                    if profiler is not None:
+                        profiler.record(STAGE_DECODE, time.perf_counter() - started)
                     return {  # noqa: TRY300
                         "data": data,  # Original hex string
                         "decoded": decoded_value,  # Decoded value
@@ -143,22 +429,83 @@ class JudoConnectivityModuleApiClient:
 
         return response
 
-    async def _async_get_endpoint(self, endpoint: str) -> dict:
-        """Make a GET request to an endpoint."""
-        url = f"http://{self._hostname}/api/rest/{endpoint}"
-
+    async def _async_send(self, url: str) -> tuple[aiohttp.ClientResponse, bytes]:
+        """Send a GET request, returning the response and the body of a 200."""
         async with async_timeout.timeout(10):
             response = await self._session.get(
-                url,
-                auth=aiohttp.BasicAuth(self._username, self._password),
+                url, auth=aiohttp.BasicAuth(self._username, self._password)
             )
-            self._verify_response_or_raise(response)
-            text = await response.text()
+            if response.status == HTTP_SUCCESS_STATUS:
+                return response, await response.read()
+            # The body is not read, hand the connection back to the pool
+            response.release()
+            return response, b""
+
+    async def _async_get_endpoint(
+        self, endpoint: str, priority: int = PRIORITY_ROUTINE
+    ) -> tuple[Any, bytes | None]:
+        """Make a GET request to an endpoint, returning the body and its payload."""
+        url = f"http://{self._hostname}/api/rest/{endpoint}"
+
+        profiler = self.profiler
+        if profiler is not None:
+            started = time.perf_counter()
+        recorder = self.recorder
+
+        for _ in range(MAX_RETRIES + 1):
+            # Requests wait here while the host is paused or the bucket is empty,
+            # without holding a slot another request could use in the meantime
+            await self._governor.acquire()
+            # Requests wait here for a slot, interactive ones ahead of the others
+            async with self._queue.slot(priority):
+                if recorder is not None:
+                    sent = time.monotonic()
+                try:
+                    response, body = await self._async_send(url)
+                except (TimeoutError, aiohttp.ClientError) as exception:
+                    if recorder is not None:
+                        recorder.record_error(
+                            endpoint, sent, time.monotonic(), exception
+                        )
+                    raise
+            if recorder is not None:
+                recorder.record(
+                    endpoint,
+                    sent,
+                    time.monotonic(),
+                    response.status,
+                    body,
+                    response.headers,
+                )
+            if response.status in HTTP_UNSUPPORTED_STATUSES:
+                raise JudoConnectivityModuleApiClientUnsupportedError(
+                    endpoint, response.status
+                )
+            if response.status != HTTP_TOO_MANY_REQUESTS:
+                self._verify_response_or_raise(response)
+                break
+            retry_after = self._retry_after(response)
+            LOGGER.debug(
+                "%s is rate limited, pausing requests for %s seconds",
+                self._hostname,
+                retry_after,
+            )
+            self._governor.pause(retry_after)
+        else:
+            error_message = (
+                f"{self._hostname} is still rate limited after {MAX_RETRIES} retries"
+            )
+            raise JudoConnectivityModuleApiClientCommunicationError(error_message)
+
+        if profiler is not None:
+            received = time.perf_counter()
+            profiler.record(STAGE_REQUEST, received - started)
+
+        result = parse_response(body)
 
-            try:
-                return json.loads(text)
-            except json.JSONDecodeError:
-                return {"data": text.strip()}
+        if profiler is not None:
+            profiler.record(STAGE_JSON_PARSE, time.perf_counter() - received)
+        return result
 
     @property
     def hostname(self) -> str:
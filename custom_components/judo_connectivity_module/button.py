@@ -5,9 +5,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
+from homeassistant.exceptions import HomeAssistantError
 
+from .coordinator import OPERATION_ERRORS
 from .entity import JudoConnectivityModuleEntity
-from .helpers import load_entity_configs
+from .poll_plan import get_poll_plan
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -25,25 +27,20 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the button platform."""
-    entity_configs = load_entity_configs()
-
-    # Filter for button entities
-    button_entities = [
-        (key, config)
-        for key, config in entity_configs.items()
-        if config.get("type") == "button"
-    ]
+    coordinator = entry.runtime_data.coordinator
+    # Only entities the detected device type supports
+    plan = coordinator.poll_plan or get_poll_plan(None)
 
     async_add_entities(
         JudoConnectivityModuleButton(
-            coordinator=entry.runtime_data.coordinator,
+            coordinator=coordinator,
             entity_description=ButtonEntityDescription(
                 key=key,
                 name=config["name"],
                 icon=config.get("icon"),
             ),
         )
-        for key, config in button_entities
+        for key, config in plan.buttons
     )
 
 
@@ -62,6 +59,11 @@ class JudoConnectivityModuleButton(JudoConnectivityModuleEntity, ButtonEntity):
             f"{coordinator.config_entry.entry_id}_{entity_description.key}"
         )
 
-    def press(self) -> None:
-        """Handle the button press synchronously."""
-        self.hass.async_create_task(self.async_press())
+    async def async_press(self) -> None:
+        """Send the button's command, ahead of queued polls and fetches."""
+        client = self.coordinator.config_entry.runtime_data.client
+        try:
+            await getattr(client, f"async_{self.entity_description.key}")()
+        except OPERATION_ERRORS as exception:
+            error_message = f"{self.name} failed: {exception}"
+            raise HomeAssistantError(error_message) from exception
@@ -0,0 +1,195 @@
+"""Traffic recording and replay for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import time
+from collections import deque
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import yarl
+from multidict import CIMultiDict, CIMultiDictProxy
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from pathlib import Path
+
+CASSETTE_VERSION = 1
+# Recording stops on its own after this many exchanges
+MAX_CASSETTE_ENTRIES = 100_000
+# Headers worth keeping, the device sends hardly any
+RECORDED_HEADERS = ("Retry-After",)
+# Transport errors recorded by the first matching type and raised again on replay
+RECORDED_ERRORS: tuple[type[Exception], ...] = (
+    TimeoutError,
+    aiohttp.ServerDisconnectedError,
+    aiohttp.ClientOSError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    aiohttp.ClientError,
+)
+RECORDED_ERRORS_BY_NAME = {error.__name__: error for error in RECORDED_ERRORS}
+
+
+class CassetteMissError(aiohttp.ClientError):
+    """Exception raised when a replayed request was never recorded."""
+
+
+class CassetteRecorder:
+    """Collect requests and responses or transport errors with their timing."""
+
+    def __init__(self, host: str, max_entries: int = MAX_CASSETTE_ENTRIES) -> None:
+        """Initialize."""
+        self.host = host
+        self.max_entries = max_entries
+        self.started = datetime.now(UTC)
+        self._origin = time.monotonic()
+        self.entries: list[dict[str, Any]] = []
+
+    @property
+    def full(self) -> bool:
+        """Return whether no more exchanges are recorded."""
+        return len(self.entries) >= self.max_entries
+
+    def record(  # noqa: PLR0913
+        self,
+        command: str,
+        sent: float,
+        received: float,
+        status: int,
+        body: bytes,
+        headers: Mapping[str, str],
+    ) -> None:
+        """Record one exchange, given monotonic send and receive times."""
+        if self.full:
+            return
+        entry: dict[str, Any] = {
+            "t": round(sent - self._origin, 6),
+            "d": round(received - sent, 6),
+            "c": command,
+            "s": status,
+            # Latin-1 maps every byte to one code point and back
+            "b": body.decode("latin-1"),
+        }
+        if recorded := {
+            name: headers[name] for name in RECORDED_HEADERS if name in headers
+        }:
+            entry["h"] = recorded
+        self.entries.append(entry)
+
+    def record_error(
+        self, command: str, sent: float, failed: float, exception: Exception
+    ) -> None:
+        """Record a request that failed without a response, such as a timeout."""
+        if self.full:
+            return
+        error = next(
+            (error for error in RECORDED_ERRORS if isinstance(exception, error)),
+            aiohttp.ClientError,
+        )
+        self.entries.append(
+            {
+                "t": round(sent - self._origin, 6),
+                "d": round(failed - sent, 6),
+                "c": command,
+                "e": error.__name__,
+                "m": str(exception),
+            }
+        )
+
+    def dumps(self) -> bytes:
+        """Return the cassette as gzipped JSON lines."""
+        header = {
+            "version": CASSETTE_VERSION,
+            "host": self.host,
+            "started": self.started.isoformat(),
+        }
+        lines = [json.dumps(header, separators=(",", ":"))]
+        lines.extend(json.dumps(entry, separators=(",", ":")) for entry in self.entries)
+        return gzip.compress(("\n".join(lines) + "\n").encode())
+
+    def save(self, path: Path) -> None:
+        """Write the cassette to a file."""
+        path.write_bytes(self.dumps())
+
+
+def load_cassette(path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Return the header and the entries of a cassette file."""
+    lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+    header = json.loads(lines[0])
+    if header.get("version") != CASSETTE_VERSION:
+        error_message = f"Unsupported cassette version: {header.get('version')}"
+        raise ValueError(error_message)
+    return header, [json.loads(line) for line in lines[1:] if line]
+
+
+class CassetteResponse:
+    """Recorded response standing in for aiohttp.ClientResponse."""
+
+    def __init__(self, url: str, entry: Mapping[str, Any]) -> None:
+        """Initialize."""
+        self.url = url
+        self.status: int = entry["s"]
+        self.headers: dict[str, str] = dict(entry.get("h", {}))
+        self.request_info = aiohttp.RequestInfo(
+            yarl.URL(url), "GET", CIMultiDictProxy(CIMultiDict())
+        )
+        self.history = ()
+        self._body = entry["b"].encode("latin-1")
+
+    async def read(self) -> bytes:
+        """Return the response body."""
+        return self._body
+
+    async def text(self) -> str:
+        """Return the response body as text."""
+        return self._body.decode()
+
+    def release(self) -> None:
+        """Hand the connection back, nothing to do for a recorded response."""
+
+
+class CassetteSession:
+    """
+    Replay transport standing in for aiohttp.ClientSession.
+
+    Responses are returned per command in recorded order; the last response of
+    a command is repeated once the recording runs out. Recorded transport errors
+    are raised again. With ``realtime`` each response or error takes as long as
+    it did on the device.
+    """
+
+    def __init__(
+        self, entries: Iterable[Mapping[str, Any]], *, realtime: bool = True
+    ) -> None:
+        """Initialize."""
+        self.realtime = realtime
+        self._responses: dict[str, deque[Mapping[str, Any]]] = {}
+        for entry in entries:
+            self._responses.setdefault(entry["c"], deque()).append(entry)
+
+    @classmethod
+    def from_file(cls, path: Path, *, realtime: bool = True) -> CassetteSession:
+        """Create a replay transport from a cassette file."""
+        _, entries = load_cassette(path)
+        return cls(entries, realtime=realtime)
+
+    async def get(self, url: str, **_kwargs: Any) -> CassetteResponse:
+        """Answer a GET request from the recording."""
+        # http://<host>/api/rest/<command>
+        command = url.rsplit("/", 1)[-1]
+        responses = self._responses.get(command)
+        if not responses:
+            error_message = f"No recorded response for {command}"
+            raise CassetteMissError(error_message)
+        entry = responses.popleft() if len(responses) > 1 else responses[0]
+        if self.realtime and entry["d"] > 0:
+            await asyncio.sleep(entry["d"])
+        if "e" in entry:
+            error = RECORDED_ERRORS_BY_NAME.get(entry["e"], aiohttp.ClientError)
+            raise error(entry["m"])
+        return CassetteResponse(url, entry)
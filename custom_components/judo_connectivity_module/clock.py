@@ -0,0 +1,107 @@
+"""Locally derived device clock for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+# Worst case drift assumed until it has been measured (a typical RTC crystal)
+DEFAULT_DRIFT_BOUND = 100e-6
+# Predicted error in seconds after which the device clock is read again
+DEFAULT_RESYNC_THRESHOLD = 5.0
+# The device reports whole seconds
+CLOCK_RESOLUTION = 1.0
+# Shortest interval between two reads used to measure drift
+MIN_DRIFT_BASELINE = 3600.0
+# Read the device clock at least once a day regardless of the prediction
+MAX_SYNC_AGE = 86400.0
+
+
+def next_boundary(moment: datetime, period: timedelta) -> datetime:
+    """Return the first multiple of a period since midnight after a moment."""
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight + (moment - midnight) // period * period + period
+
+
+class DeviceClock:
+    """Predict the device clock from occasional reads of it."""
+
+    def __init__(
+        self,
+        resync_threshold: float = DEFAULT_RESYNC_THRESHOLD,
+        drift_bound: float = DEFAULT_DRIFT_BOUND,
+    ) -> None:
+        """Initialize."""
+        self._resync_threshold = resync_threshold
+        self._drift_bound = drift_bound
+        # (monotonic time, device time) of the first and the latest read
+        self._origin: tuple[float, datetime] | None = None
+        self._anchor: tuple[float, datetime] | None = None
+        self._drift = 0.0
+        self._drift_uncertainty = drift_bound
+
+    @property
+    def drift(self) -> float:
+        """Return the measured drift of the device clock (seconds per second)."""
+        return self._drift
+
+    def sync(self, device_time: datetime, monotonic: float | None = None) -> None:
+        """Record a device clock reading."""
+        now = time.monotonic() if monotonic is None else monotonic
+
+        if self._anchor is not None:
+            error = abs((device_time - self._predict(now)).total_seconds())
+            if error > self._resync_threshold + CLOCK_RESOLUTION:
+                # The clock was set or jumped, earlier readings no longer apply
+                self._origin = None
+                self._drift = 0.0
+                self._drift_uncertainty = self._drift_bound
+
+        if self._origin is None:
+            self._origin = (now, device_time)
+        elif (baseline := now - self._origin[0]) >= MIN_DRIFT_BASELINE:
+            device_elapsed = (device_time - self._origin[1]).total_seconds()
+            self._drift = (device_elapsed - baseline) / baseline
+            # Both readings are truncated to whole seconds
+            self._drift_uncertainty = min(
+                self._drift_bound, 2 * CLOCK_RESOLUTION / baseline
+            )
+
+        self._anchor = (now, device_time)
+
+    def _predict(self, now: float) -> datetime:
+        """Return the predicted device time at a monotonic time."""
+        if self._anchor is None:
+            error_message = "Device clock has not been synchronized"
+            raise RuntimeError(error_message)
+        anchor_time, anchor_device_time = self._anchor
+        elapsed = now - anchor_time
+        return anchor_device_time + timedelta(seconds=elapsed * (1 + self._drift))
+
+    def now(self, monotonic: float | None = None) -> datetime | None:
+        """Return the predicted current device time."""
+        if self._anchor is None:
+            return None
+        return self._predict(time.monotonic() if monotonic is None else monotonic)
+
+    def needs_sync(self, monotonic: float | None = None) -> bool:
+        """Return whether the predicted error requires reading the device clock."""
+        if self._anchor is None:
+            return True
+        now = time.monotonic() if monotonic is None else monotonic
+        elapsed = now - self._anchor[0]
+        predicted_error = CLOCK_RESOLUTION + elapsed * self._drift_uncertainty
+        return elapsed >= MAX_SYNC_AGE or predicted_error > self._resync_threshold
+
+    def seconds_until(
+        self, device_time: datetime, monotonic: float | None = None
+    ) -> float | None:
+        """Return the local seconds until the device clock shows a time."""
+        now = self.now(monotonic)
+        if now is None:
+            return None
+        return (device_time - now).total_seconds() / (1 + self._drift)
@@ -9,16 +9,33 @@ from typing import Any
 import voluptuous as vol
 from dotenv import load_dotenv
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+)
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import (
+    DEFAULT_BURST,
+    DEFAULT_RATE_LIMIT,
     JudoConnectivityModuleApiClient,
     JudoConnectivityModuleApiClientAuthenticationError,
     JudoConnectivityModuleApiClientCommunicationError,
     JudoConnectivityModuleApiClientError,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_ALIGNED_POLLING,
+    CONF_BURST,
+    CONF_RATE_LIMIT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    LOGGER,
+    MIN_RATE_LIMIT,
+    MIN_SCAN_INTERVAL,
+)
+from .helpers import get_entry_config
 from .utils import decode_serial_number, get_device_name
 
 # Load environment variables from .env file
@@ -132,22 +149,39 @@ class JudoConnectivityModuleOptionsFlow(config_entries.OptionsFlow):
                 LOGGER.exception("API error occurred: %s", exception)
                 errors["base"] = "unknown"
 
+        config = get_entry_config(self.config_entry.data, self.config_entry.options)
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Required(
                         CONF_HOST,
-                        default=self.config_entry.data.get(CONF_HOST),
+                        default=config.get(CONF_HOST),
                     ): str,
                     vol.Required(
                         CONF_USERNAME,
-                        default=self.config_entry.data.get(CONF_USERNAME),
+                        default=config.get(CONF_USERNAME),
                     ): str,
                     vol.Required(
                         CONF_PASSWORD,
-                        default=self.config_entry.data.get(CONF_PASSWORD),
+                        default=config.get(CONF_PASSWORD),
                     ): str,
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL)),
+                    vol.Required(
+                        CONF_ALIGNED_POLLING,
+                        default=config.get(CONF_ALIGNED_POLLING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_RATE_LIMIT,
+                        default=config.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=MIN_RATE_LIMIT)),
+                    vol.Required(
+                        CONF_BURST,
+                        default=config.get(CONF_BURST, DEFAULT_BURST),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
                 }
             ),
             errors=errors,
@@ -6,3 +6,23 @@ LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "judo_connectivity_module"
 ATTRIBUTION = "Data provided by JUDO Connectivity Module"
+
+DEFAULT_SCAN_INTERVAL = 3600  # seconds
+MIN_SCAN_INTERVAL = 10  # seconds
+
+# Poll just after the hour boundaries of the device clock instead of the interval
+CONF_ALIGNED_POLLING = "aligned_polling"
+# Time the device gets to close an hour before it is polled
+ALIGNED_POLL_DELAY = 60  # seconds
+
+# Request rate allowed per device, defaults are in api_spec/base.yaml
+CONF_RATE_LIMIT = "rate_limit"  # requests per second
+CONF_BURST = "burst"
+MIN_RATE_LIMIT = 0.1  # requests per second
+
+# Delays before operations that failed in a poll cycle are requested again
+RETRY_BACKOFF = (10, 30, 90, 270)  # seconds
+
+# Operations each device rejected, persisted across restarts
+UNSUPPORTED_STORAGE_VERSION = 1
+UNSUPPORTED_SAVE_DELAY = 10  # seconds
@@ -0,0 +1,227 @@
+"""Cumulative consumption index for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import calendar
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
+
+SECONDS_PER_DAY = 86400
+ONE_DAY = timedelta(days=1)
+
+
+def _month_key(day: date) -> int:
+    """Return a number counting months, consecutive across years."""
+    return day.year * 12 + day.month - 1
+
+
+def _seconds(moment: datetime) -> int | None:
+    """Return the second of the day of a moment, None below a second."""
+    if moment.microsecond:
+        return None
+    return moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+def _round(value: float | None) -> float | None:
+    """Round a sum to liters to drop float noise."""
+    return None if value is None else round(value, 3)
+
+
+class _PrefixSums:
+    """Values of consecutive slots with prefix sums for O(1) range totals."""
+
+    def __init__(self, size: int = 0, offset: int = 0) -> None:
+        """Initialize with ``size`` unknown slots numbered from ``offset``."""
+        self.offset = offset
+        self._values: list[float | None] = [None] * size
+        # Sum of the values and number of unknown slots before each slot
+        self._sums = [0.0] * (size + 1)
+        self._missing = list(range(size + 1))
+
+    def __len__(self) -> int:
+        """Return the number of slots."""
+        return len(self._values)
+
+    @property
+    def complete(self) -> bool:
+        """Return whether every slot is known."""
+        return bool(self._values) and not self._missing[-1]
+
+    def get(self, index: int) -> float | None:
+        """Return the value of a slot, None if unknown."""
+        position = index - self.offset
+        if 0 <= position < len(self._values):
+            return self._values[position]
+        return None
+
+    def set(self, index: int, value: float) -> None:
+        """Set the value of a slot, growing the slots as needed."""
+        position = index - self.offset
+        size = len(self._values)
+        if not size:
+            self.offset, position = index, 0
+        if position < 0:
+            self._values[:0] = [None] * -position
+            self.offset, position, size = index, 0, 0
+            self._sums, self._missing = [0.0], [0]
+        elif position >= len(self._values):
+            self._values.extend([None] * (position + 1 - len(self._values)))
+        self._values[position] = value
+        self._update(min(position, size))
+
+    def _update(self, start: int) -> None:
+        """Recompute the prefix sums from a position on."""
+        sums, missing = self._sums, self._missing
+        del sums[start + 1 :], missing[start + 1 :]
+        for value in self._values[start:]:
+            sums.append(sums[-1] if value is None else sums[-1] + value)
+            missing.append(missing[-1] + (value is None))
+
+    def span(self, start: int, stop: int) -> float | None:
+        """Return the total of slots [start, stop), None if any is unknown."""
+        if start >= stop:
+            return 0.0
+        start -= self.offset
+        stop -= self.offset
+        if start < 0 or stop > len(self._values):
+            return None
+        if self._missing[stop] != self._missing[start]:
+            return None
+        return self._sums[stop] - self._sums[start]
+
+
+class ConsumptionIndex:
+    """
+    Consumption of one device kept as prefix sums at three granularities.
+
+    The device buckets of a day, the days of a month and all months each have
+    prefix sums, so the total of any range takes a constant number of lookups.
+    Complete buckets roll up into their day and complete days into their
+    month; totals reported by the device are never replaced by rollups. Times
+    are wall-clock times of the device, time zones are ignored.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._buckets: dict[date, _PrefixSums] = {}
+        self._days: dict[int, _PrefixSums] = {}
+        self._months = _PrefixSums()
+        self._reported_days: set[date] = set()
+        self._reported_months: set[int] = set()
+
+    def add_buckets(self, day: date, values: Sequence[float | None]) -> None:
+        """Add the equally long buckets of a day, None for ones not over yet."""
+        buckets = self._buckets.get(day)
+        if buckets is None or len(buckets) != len(values):
+            buckets = self._buckets[day] = _PrefixSums(len(values))
+        for index, value in enumerate(values):
+            if value is not None:
+                buckets.set(index, value)
+        if buckets.complete and day not in self._reported_days:
+            self._set_day(day, buckets.span(0, len(buckets)) or 0.0)
+
+    def add_day(self, day: date, value: float) -> None:
+        """Add the total of a day."""
+        self._reported_days.add(day)
+        self._set_day(day, value)
+
+    def add_month(self, year: int, month: int, value: float) -> None:
+        """Add the total of a month."""
+        key = _month_key(date(year, month, 1))
+        self._reported_months.add(key)
+        self._months.set(key, value)
+
+    def _set_day(self, day: date, value: float) -> None:
+        """Store the total of a day and roll a complete month up."""
+        key = _month_key(day)
+        days = self._days.get(key)
+        if days is None:
+            length = calendar.monthrange(day.year, day.month)[1]
+            days = self._days[key] = _PrefixSums(length, offset=1)
+        days.set(day.day, value)
+        if days.complete and key not in self._reported_months:
+            self._months.set(key, days.span(1, len(days) + 1) or 0.0)
+
+    def total(self, start: datetime, end: datetime) -> float | None:
+        """Return the consumption in [start, end) in m³, None if not indexed."""
+        if end < start:
+            error_message = "Start must not be after end"
+            raise ValueError(error_message)
+        first, last = start.date(), end.date()
+        start_second, end_second = _seconds(start), _seconds(end)
+        if start_second is None or end_second is None:
+            return None
+        if first == last:
+            return _round(self._day_span(first, start_second, end_second))
+
+        # Whole days are taken from the day and month sums
+        parts = (
+            self._day_span(first, start_second, SECONDS_PER_DAY)
+            if start_second
+            else 0.0,
+            self._days_span(first + ONE_DAY if start_second else first, last),
+            self._day_span(last, 0, end_second),
+        )
+        if None in parts:
+            return None
+        return _round(sum(parts))  # type: ignore[arg-type]
+
+    def daily(self, start: date, end: date) -> list[tuple[date, float | None]]:
+        """Return the consumption of each day in [start, end] in m³."""
+        rows = []
+        day = start
+        while day <= end:
+            rows.append((day, self._day_total(day)))
+            day += ONE_DAY
+        return rows
+
+    def _day_total(self, day: date) -> float | None:
+        """Return the total of a day."""
+        days = self._days.get(_month_key(day))
+        return None if days is None else _round(days.get(day.day))
+
+    def _day_span(self, day: date, start: int, stop: int) -> float | None:
+        """Return the total of the seconds [start, stop) of a day."""
+        if start == stop:
+            return 0.0
+        if start == 0 and stop == SECONDS_PER_DAY:
+            return self._day_total(day)
+        buckets = self._buckets.get(day)
+        if buckets is None:
+            return None
+        size = len(buckets)
+        # Boundaries inside a bucket cannot be answered
+        if (start * size) % SECONDS_PER_DAY or (stop * size) % SECONDS_PER_DAY:
+            return None
+        return buckets.span(
+            start * size // SECONDS_PER_DAY, stop * size // SECONDS_PER_DAY
+        )
+
+    def _days_span(self, first: date, stop: date) -> float | None:
+        """Return the total of the days [first, stop)."""
+        if first >= stop:
+            return 0.0
+        first_month, stop_month = _month_key(first), _month_key(stop)
+        if first_month == stop_month:
+            days = self._days.get(first_month)
+            return None if days is None else days.span(first.day, stop.day)
+
+        # Partial first month, whole months in between, partial last month
+        head: float | None = 0.0
+        months_from = first_month
+        if first.day != 1:
+            days = self._days.get(first_month)
+            head = None if days is None else days.span(first.day, len(days) + 1)
+            months_from += 1
+        tail: float | None = 0.0
+        if stop.day != 1:
+            days = self._days.get(stop_month)
+            tail = None if days is None else days.span(1, stop.day)
+        middle = self._months.span(months_from, stop_month)
+        if head is None or middle is None or tail is None:
+            return None
+        return head + middle + tail
@@ -2,23 +2,54 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
     JudoConnectivityModuleApiClient,
     JudoConnectivityModuleApiClientAuthenticationError,
     JudoConnectivityModuleApiClientError,
+    JudoConnectivityModuleApiClientUnsupportedError,
+)
+from .clock import next_boundary
+from .const import (
+    ALIGNED_POLL_DELAY,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    LOGGER,
+    RETRY_BACKOFF,
+)
+from .poll_plan import PollPlan, get_poll_plan
+from .profiler import (
+    STAGE_COORDINATOR_UPDATE,
+    STAGE_ENTITY_WRITES,
+    PollCycleProfiler,
 )
-from .const import DOMAIN, LOGGER
-from .helpers import load_entity_configs
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from homeassistant.core import HomeAssistant
 
+    from .statistics import StatisticsFetcher
+
+# Errors of a single operation, the other operations of a cycle still count
+OPERATION_ERRORS = (
+    JudoConnectivityModuleApiClientError,
+    aiohttp.ClientError,
+    TimeoutError,
+)
+
+ONE_HOUR = timedelta(hours=1)
+
 
 class JudoConnectivityModuleDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
@@ -27,29 +58,261 @@ class JudoConnectivityModuleDataUpdateCoordinator(DataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         client: JudoConnectivityModuleApiClient,
+        update_interval: timedelta = timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+        *,
+        aligned: bool = False,
     ) -> None:
         """Initialize."""
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(hours=1),
+            update_interval=update_interval,
         )
-        self._entity_configs = load_entity_configs()
         self._client = client
+        # Resolved from the device type on the first update
+        self.poll_plan: PollPlan | None = None
+        self._profiler: PollCycleProfiler | None = None
+        self.profile_report: dict[str, Any] | None = None
+        # Operations that failed in the last cycle, retried until they succeed
+        self.failed_operations: dict[str, str] = {}
+        self._retries = 0
+        self._unsub_retry: CALLBACK_TYPE | None = None
+        # Regular updates started, a retry spanning one does not commit
+        self._cycles = 0
+        # Configured time between polls, update_interval is set from it after
+        # every poll. Aligned polls follow the device's hour boundaries instead
+        # and fall back to it while the device clock is unknown.
+        self.scan_interval = update_interval
+        self.aligned = aligned
+        # Closed statistics buckets are indexed in aligned polls once set
+        self.statistics: StatisticsFetcher | None = None
+
+    @property
+    def profiling(self) -> bool:
+        """Return whether poll cycles are currently profiled."""
+        return self._profiler is not None
+
+    def async_start_profiling(self, cycles: int) -> None:
+        """Profile the next poll cycles, unless another entry is profiled."""
+        profiler = PollCycleProfiler(cycles)
+        profiler.start()
+        self._profiler = self._client.profiler = profiler
+
+    @callback
+    def _async_finish_profiling(self) -> None:
+        """Store the report of the profiled poll cycles."""
+        if (profiler := self._profiler) is None:
+            return
+        self._profiler = None
+        self._client.profiler = None
+        profiler.stop()
+        self.profile_report = profiler.report()
+        LOGGER.info("Profiled %s poll cycles of %s", profiler.completed, self.name)
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via library."""
         try:
-            data = {}
-            # Get data for all sensor entities
-            for entity_id, config in self._entity_configs.items():
-                if config["type"] == "sensor":
-                    method_name = f"async_{entity_id}"
-                    if hasattr(self._client, method_name):
-                        data[entity_id] = await getattr(self._client, method_name)()
-            return data  # noqa: TRY300
+            return await self._async_profile_update()
+        finally:
+            # The next poll is scheduled with it once the update is done
+            self.update_interval = self._next_update_interval()
+
+    async def _async_profile_update(self) -> dict[str, Any]:
+        """Fetch the data, timing the stages while poll cycles are profiled."""
+        profiler = self._profiler
+        if profiler is None:
+            return await self._async_fetch_data()
+
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            return await self._async_fetch_data()
+        finally:
+            profiler.disable()
+            profiler.record(STAGE_COORDINATOR_UPDATE, time.perf_counter() - started)
+            profiler.completed += 1
+            if profiler.finished:
+                # Listeners are updated right after this returns, report after that
+                self.hass.loop.call_soon(self._async_finish_profiling)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners."""
+        profiler = self._profiler
+        if profiler is None:
+            super().async_update_listeners()
+            return
+
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            super().async_update_listeners()
+        finally:
+            profiler.disable()
+            profiler.record(STAGE_ENTITY_WRITES, time.perf_counter() - started)
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Request the values of all sensor entities."""
+        self._cancel_retry()
+        self._retries = 0
+        self._cycles += 1
+        try:
+            if self.poll_plan is None:
+                self.poll_plan = await self._async_resolve_poll_plan()
         except JudoConnectivityModuleApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except JudoConnectivityModuleApiClientError as exception:
             raise UpdateFailed(exception) from exception
+
+        # Only operations the device type supports and the device did not reject
+        unsupported = self._client.unsupported
+        operations = [
+            operation
+            for operation in self.poll_plan.operations
+            if operation not in unsupported
+        ]
+        results, errors = await self._async_fetch_operations(operations)
+        self._set_failed_operations(errors)
+        if operations and len(errors) == len(operations):
+            raise UpdateFailed(next(iter(errors.values())))
+        data = self._merge_results(results)
+        self._schedule_retry()
+        if self.aligned:
+            await self._async_ingest_statistics()
+        return data
+
+    async def _async_ingest_statistics(self) -> None:
+        """Index the statistics buckets the device closed since the last poll."""
+        clock = self._client.device_clock
+        try:
+            if clock.needs_sync():
+                await self._client.async_read_datetime()
+            if self.statistics is None or (device_time := clock.now()) is None:
+                return
+            await self.statistics.async_ingest_closed(device_time)
+        except JudoConnectivityModuleApiClientAuthenticationError as exception:
+            raise ConfigEntryAuthFailed(exception) from exception
+        except OPERATION_ERRORS as exception:
+            # Buckets not indexed yet are read in the next aligned poll
+            LOGGER.debug("Failed to index statistics of %s: %s", self.name, exception)
+
+    @callback
+    def async_reschedule(self) -> None:
+        """Schedule the next poll anew, keeping the data and update status."""
+        self.update_interval = self._next_update_interval()
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _next_update_interval(self) -> timedelta:
+        """Return the time until the next poll, after the device hour if aligned."""
+        if self.aligned and (delay := self._aligned_delay()) is not None:
+            return timedelta(seconds=delay)
+        return self.scan_interval
+
+    def _aligned_delay(self) -> float | None:
+        """Return the seconds until just after the next device hour boundary."""
+        clock = self._client.device_clock
+        device_time = clock.now()
+        if device_time is None:
+            return None
+        target = next_boundary(device_time, ONE_HOUR) + timedelta(
+            seconds=ALIGNED_POLL_DELAY
+        )
+        # Still within the delay after the last boundary
+        if target - device_time > ONE_HOUR:
+            target -= ONE_HOUR
+        return clock.seconds_until(target)
+
+    async def _async_fetch_operations(
+        self, operations: Iterable[str]
+    ) -> tuple[dict[str, Any], dict[str, Exception]]:
+        """Request operations, returning new results (None to drop) and errors."""
+        results: dict[str, Any] = {}
+        errors: dict[str, Exception] = {}
+        for operation in operations:
+            try:
+                result = await getattr(self._client, f"async_{operation}")()
+            except JudoConnectivityModuleApiClientAuthenticationError as exception:
+                raise ConfigEntryAuthFailed(exception) from exception
+            except JudoConnectivityModuleApiClientUnsupportedError as exception:
+                if operation in self._client.unsupported:
+                    # The device answered, the operation is just not polled anymore
+                    LOGGER.info("%s: %s", self.name, exception)
+                    results[operation] = None
+                else:
+                    errors[operation] = exception
+                continue
+            except OPERATION_ERRORS as exception:
+                errors[operation] = exception
+                continue
+            # Results may be cached by the client, the timestamp goes on a copy
+            results[operation] = {**result, "fetched_at": dt_util.utcnow()}
+        return results, errors
+
+    def _merge_results(self, results: dict[str, Any]) -> dict[str, Any]:
+        """Return the current data with new results, keeping other values."""
+        data = dict(self.data or {})
+        for operation, result in results.items():
+            if result is None:
+                data.pop(operation, None)
+            else:
+                data[operation] = result
+        return data
+
+    def _set_failed_operations(self, errors: dict[str, Exception]) -> None:
+        """Remember the operations that failed to retry them."""
+        self.failed_operations = {
+            operation: repr(exception) for operation, exception in errors.items()
+        }
+        if errors:
+            LOGGER.debug("Failed to update %s: %s", self.name, self.failed_operations)
+
+    @callback
+    def _schedule_retry(self) -> None:
+        """Retry the failed operations after a backoff delay."""
+        if not self.failed_operations or self._retries >= len(RETRY_BACKOFF):
+            return
+        self._unsub_retry = async_call_later(
+            self.hass, RETRY_BACKOFF[self._retries], self._async_retry_failed
+        )
+        self._retries += 1
+
+    @callback
+    def _cancel_retry(self) -> None:
+        """Cancel a pending retry of failed operations."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    async def _async_retry_failed(self, _now: datetime) -> None:
+        """Request the operations that failed again and commit what succeeds."""
+        self._unsub_retry = None
+        operations = list(self.failed_operations)
+        cycle = self._cycles
+        try:
+            results, errors = await self._async_fetch_operations(operations)
+        except ConfigEntryAuthFailed:
+            # The next regular update starts the reauthentication
+            return
+        if cycle != self._cycles:
+            # A regular update ran meanwhile, its values and retries are newer
+            return
+        self._set_failed_operations(errors)
+        if results:
+            # Only the retried values changed, the update schedule stays
+            self.data = self._merge_results(results)
+            self.async_update_listeners()
+        self._schedule_retry()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending retries and profiling and shut down the coordinator."""
+        self._cancel_retry()
+        self._async_finish_profiling()
+        await super().async_shutdown()
+
+    async def _async_resolve_poll_plan(self) -> PollPlan:
+        """Detect the device type and return its poll plan."""
+        result = await self._client.async_get_device_type()
+        device_type = result.get("decoded")
+        return get_poll_plan(None if device_type == "unknown" else str(device_type))
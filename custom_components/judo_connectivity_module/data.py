@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
 
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
     from .api import JudoConnectivityModuleApiClient
     from .coordinator import JudoConnectivityModuleDataUpdateCoordinator
+    from .statistics import StatisticsFetcher
 
 
 @dataclass
@@ -21,6 +22,9 @@ class JudoConnectivityModuleData:
     client: JudoConnectivityModuleApiClient
     coordinator: JudoConnectivityModuleDataUpdateCoordinator
     integration: Integration
+    statistics: StatisticsFetcher
+    # Entry data merged with options, as applied to the client and coordinator
+    config: dict[str, Any]
 
 
 T = TypeVar("T")
@@ -0,0 +1,33 @@
+"""Diagnostics support for judo_connectivity_module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import JudoConnectivityModuleConfigEntry
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    _hass: HomeAssistant,
+    entry: JudoConnectivityModuleConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "data": coordinator.data,
+        "failed_operations": coordinator.failed_operations,
+        # Operations the device rejected, not polled until the firmware changes
+        "unsupported_operations": entry.runtime_data.client.unsupported.as_dict(),
+        # Report of the last profile_poll_cycles run
+        "profile": coordinator.profile_report,
+    }
@@ -2,20 +2,12 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-
-import yaml
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import ATTRIBUTION, DOMAIN
 from .coordinator import JudoConnectivityModuleDataUpdateCoordinator
-
-# Load device specifications
-API_SPEC_DIR = Path(__file__).parent / "api_spec"
-DEVICES = yaml.safe_load((API_SPEC_DIR / "devices.yaml").open(encoding="utf-8"))[
-    "device_types"
-]
+from .poll_plan import DEVICES
 
 
 class JudoConnectivityModuleEntity(
@@ -0,0 +1,87 @@
+"""Streaming export of consumption statistics for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import json
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from .statistics import RESOLUTION_3_HOURLY, RESOLUTION_DAILY
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from datetime import datetime
+
+    from .statistics import StatisticsFetcher
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_JSONL = "jsonl"
+EXPORT_FORMATS = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL]
+
+CSV_HEADER = "timestamp,consumption_m3\n"
+DEFAULT_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 5000
+
+
+def _window_end(day: date, resolution: str) -> date:
+    """Return the last day fetched together with a day."""
+    if resolution == RESOLUTION_3_HOURLY:
+        return day
+    if resolution == RESOLUTION_DAILY:
+        return date(day.year, day.month, monthrange(day.year, day.month)[1])
+    return date(day.year, 12, 31)
+
+
+async def async_iter_consumption_rows(
+    statistics: StatisticsFetcher,
+    start: date,
+    end: date,
+    resolution: str = RESOLUTION_3_HOURLY,
+) -> AsyncIterator[tuple[datetime, float]]:
+    """Yield (interval start, m³) rows for every interval in [start, end]."""
+    day = start
+    while day <= end:
+        # Each window is only requested once the consumer asks for its rows
+        window_end = min(_window_end(day, resolution), end)
+        for row in await statistics.async_fetch(day, window_end, resolution):
+            yield row
+        day = window_end + timedelta(days=1)
+
+
+def _serialize_rows(rows: list[tuple[datetime, float]], export_format: str) -> str:
+    """Serialize rows to CSV or JSON lines."""
+    if export_format == EXPORT_FORMAT_CSV:
+        return "".join(
+            f"{timestamp.isoformat()},{value}\n" for timestamp, value in rows
+        )
+    return "".join(
+        json.dumps({"timestamp": timestamp.isoformat(), "consumption": value}) + "\n"
+        for timestamp, value in rows
+    )
+
+
+async def async_iter_export_chunks(  # noqa: PLR0913
+    statistics: StatisticsFetcher,
+    start: date,
+    end: date,
+    export_format: str = EXPORT_FORMAT_CSV,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resolution: str = RESOLUTION_3_HOURLY,
+) -> AsyncIterator[str]:
+    """Yield the consumption history as chunks of at most ``chunk_size`` rows."""
+    if export_format not in EXPORT_FORMATS:
+        error_message = f"Unsupported export format: {export_format}"
+        raise ValueError(error_message)
+
+    if export_format == EXPORT_FORMAT_CSV:
+        yield CSV_HEADER
+
+    rows: list[tuple[datetime, float]] = []
+    async for row in async_iter_consumption_rows(statistics, start, end, resolution):
+        rows.append(row)
+        if len(rows) >= chunk_size:
+            yield _serialize_rows(rows, export_format)
+            rows = []
+    if rows:
+        yield _serialize_rows(rows, export_format)
@@ -0,0 +1,307 @@
+"""
+Headless polling of many JUDO devices for judo_connectivity_module.
+
+Only the API client and its Home Assistant free dependencies are used, so this
+runs wherever aiohttp is installed. Start it with scripts/fleet, which makes the
+modules importable without the integration's __init__.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+import aiohttp
+
+from .api import (
+    OPERATIONS_BY_NAME,
+    JudoConnectivityModuleApiClient,
+    JudoConnectivityModuleApiClientAuthenticationError,
+    JudoConnectivityModuleApiClientError,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+DEFAULT_USERNAME = "admin"
+DEFAULT_PASSWORD = "Connectivity"  # noqa: S105
+DEFAULT_CONCURRENCY = 200
+DEFAULT_OPERATIONS = (
+    "get_device_type",
+    "read_serial_number",
+    "read_software_version",
+    "read_total_water",
+)
+REQUEST_TIMEOUT = 10  # seconds
+# Latencies are counted in buckets growing by this factor, so percentiles are
+# accurate to 2 % and memory stays bounded however many rounds run
+LATENCY_BUCKET_GROWTH = 1.02
+MIN_LATENCY = 0.0001  # seconds, the first bucket holds all faster polls
+# Errors of one device, the other devices are polled regardless
+POLL_ERRORS = (
+    JudoConnectivityModuleApiClientError,
+    JudoConnectivityModuleApiClientAuthenticationError,
+    aiohttp.ClientError,
+    TimeoutError,
+    ValueError,
+)
+
+
+@dataclass(frozen=True)
+class FleetHost:
+    """A device and the credentials to poll it with."""
+
+    host: str
+    username: str = DEFAULT_USERNAME
+    password: str = DEFAULT_PASSWORD
+
+
+def parse_hosts(
+    lines: Iterable[str],
+    username: str = DEFAULT_USERNAME,
+    password: str = DEFAULT_PASSWORD,
+) -> list[FleetHost]:
+    """Parse ``host`` or ``username:password@host`` lines, skipping comments."""
+    hosts = []
+    for line in lines:
+        entry = line.split("#", 1)[0].strip()
+        if not entry:
+            continue
+        credentials, _, host = entry.rpartition("@")
+        if credentials:
+            user, _, secret = credentials.partition(":")
+            hosts.append(FleetHost(host, user or username, secret or password))
+        else:
+            hosts.append(FleetHost(host, username, password))
+    return hosts
+
+
+def _latency_bucket(latency: float) -> int:
+    """Return the histogram bucket of a latency."""
+    if latency <= MIN_LATENCY:
+        return 0
+    return math.ceil(math.log(latency / MIN_LATENCY, LATENCY_BUCKET_GROWTH))
+
+
+@dataclass
+class FleetStats:
+    """Throughput and latency of polled devices."""
+
+    started: float = field(default_factory=time.monotonic)
+    polls: int = 0
+    failures: int = 0
+    # Number of device polls per latency bucket
+    latencies: Counter[int] = field(default_factory=Counter)
+    max_latency: float = 0.0
+
+    def record(self, latency: float, *, failed: bool) -> None:
+        """Record one device poll."""
+        self.polls += 1
+        self.failures += failed
+        self.latencies[_latency_bucket(latency)] += 1
+        self.max_latency = max(self.max_latency, latency)
+
+    def merge(self, other: FleetStats) -> None:
+        """Add the polls of another round."""
+        self.polls += other.polls
+        self.failures += other.failures
+        self.latencies.update(other.latencies)
+        self.max_latency = max(self.max_latency, other.max_latency)
+
+    def percentile(self, percent: float) -> float:
+        """Return a latency percentile in seconds (nearest rank, bucket bound)."""
+        rank = max(math.ceil(percent / 100 * self.latencies.total()), 1)
+        for bucket in sorted(self.latencies):
+            rank -= self.latencies[bucket]
+            if rank <= 0:
+                bound = MIN_LATENCY * LATENCY_BUCKET_GROWTH**bucket
+                return min(bound, self.max_latency)
+        return 0.0
+
+    def report(self) -> dict[str, Any]:
+        """Return throughput and latency percentiles."""
+        elapsed = time.monotonic() - self.started
+        return {
+            "polls": self.polls,
+            "failures": self.failures,
+            "seconds": round(elapsed, 3),
+            "polls_per_minute": round(self.polls / elapsed * 60, 1) if elapsed else 0,
+            "latency_ms": {
+                f"p{percent}": round(self.percentile(percent) * 1000, 1)
+                for percent in (50, 90, 99)
+            }
+            | {"max": round(self.max_latency * 1000, 1)},
+        }
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize decoded values JSON does not know."""
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    return str(value)
+
+
+class FleetPoller:
+    """Poll many devices over one pooled session with bounded concurrency."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        session: aiohttp.ClientSession,
+        hosts: Sequence[FleetHost],
+        operations: Sequence[str] = DEFAULT_OPERATIONS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_limit: float | None = None,
+        burst: int | None = None,
+    ) -> None:
+        """Initialize."""
+        if unknown := [name for name in operations if name not in OPERATIONS_BY_NAME]:
+            error_message = f"Unknown operations: {unknown}"
+            raise ValueError(error_message)
+        self._operations = tuple(operations)
+        self._concurrency = max(1, min(concurrency, len(hosts) or 1))
+        # Clients keep their caches and device clocks between rounds
+        self._clients = [
+            (
+                host.host,
+                JudoConnectivityModuleApiClient(
+                    host.host, host.username, host.password, session, rate_limit, burst
+                ),
+            )
+            for host in hosts
+        ]
+
+    async def async_poll(
+        self, write: Callable[[dict[str, Any]], None], stats: FleetStats | None = None
+    ) -> FleetStats:
+        """Poll every device once, passing each result to ``write``."""
+        stats = stats or FleetStats()
+        queue: asyncio.Queue[tuple[str, JudoConnectivityModuleApiClient]] = (
+            asyncio.Queue()
+        )
+        for entry in self._clients:
+            queue.put_nowait(entry)
+
+        async def _worker() -> None:
+            while not queue.empty():
+                host, client = queue.get_nowait()
+                started = time.monotonic()
+                result = await self._async_poll_client(host, client)
+                latency = time.monotonic() - started
+                result["latency_ms"] = round(latency * 1000, 1)
+                stats.record(latency, failed=bool(result["errors"]))
+                write(result)
+
+        await asyncio.gather(*(_worker() for _ in range(self._concurrency)))
+        return stats
+
+    async def _async_poll_client(
+        self, host: str, client: JudoConnectivityModuleApiClient
+    ) -> dict[str, Any]:
+        """Request the operations of one device one after the other."""
+        values: dict[str, Any] = {}
+        errors: dict[str, str] = {}
+        for operation in self._operations:
+            try:
+                result = await getattr(client, f"async_{operation}")()
+            except POLL_ERRORS as exception:
+                errors[operation] = repr(exception)
+                if isinstance(
+                    exception, JudoConnectivityModuleApiClientAuthenticationError
+                ):
+                    break
+                continue
+            values[operation] = result.get("decoded", result)
+        return {
+            "host": host,
+            "polled_at": datetime.now(UTC).isoformat(),
+            "values": values,
+            "errors": errors,
+        }
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(
+        description="Poll JUDO Connectivity Modules without Home Assistant."
+    )
+    parser.add_argument(
+        "hosts", type=Path, help="file with one host or user:password@host per line"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="JSON lines file, stdout if omitted"
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument(
+        "--operations",
+        default=",".join(DEFAULT_OPERATIONS),
+        help="comma separated operations to request from every device",
+    )
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument(
+        "--rounds", type=int, default=1, help="poll rounds, 0 to poll until stopped"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=60.0, help="seconds between round starts"
+    )
+    parser.add_argument("--rate-limit", type=float, help="requests per second per host")
+    parser.add_argument("--burst", type=int, help="requests at once per host")
+    return parser.parse_args(argv)
+
+
+async def async_run(
+    args: argparse.Namespace, output: IO[str], report: IO[str]
+) -> FleetStats:
+    """Poll the devices of a hosts file, writing a report line after every round."""
+    hosts = parse_hosts(
+        args.hosts.read_text(encoding="utf-8").splitlines(),
+        args.username,
+        args.password,
+    )
+    operations = [name.strip() for name in args.operations.split(",") if name.strip()]
+
+    def _write(result: dict[str, Any]) -> None:
+        output.write(json.dumps(result, default=_json_default) + "\n")
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        poller = FleetPoller(
+            session, hosts, operations, args.concurrency, args.rate_limit, args.burst
+        )
+        stats = FleetStats()
+        completed = 0
+        while True:
+            started = time.monotonic()
+            round_stats = await poller.async_poll(_write)
+            stats.merge(round_stats)
+            output.flush()
+            report.write(json.dumps(round_stats.report()) + "\n")
+            completed += 1
+            if args.rounds and completed >= args.rounds:
+                return stats
+            await asyncio.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the fleet poller from the command line."""
+    args = _parse_args(argv)
+    output = args.output.open("a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats = asyncio.run(async_run(args, output, sys.stderr))
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    sys.stderr.write(json.dumps({"total": stats.report()}) + "\n")
+    return 0
@@ -0,0 +1,77 @@
+"""Per-host request rate governor for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+
+# One governor per host, alive as long as a client talking to the host is
+_GOVERNORS: weakref.WeakValueDictionary[str, HostGovernor] = (
+    weakref.WeakValueDictionary()
+)
+
+
+class HostGovernor:
+    """
+    Token bucket limiting the rate of requests sent to one host.
+
+    The bucket is kept as the theoretical arrival time of the next request
+    (GCRA): every request reserves its send slot synchronously, so waiting
+    requests are sent in the order they arrived without holding a lock.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize."""
+        self._interval = 1 / rate
+        self._tolerance = self._interval * (burst - 1)
+        self._tat = 0.0
+        self._paused_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Return the sustained rate in requests per second."""
+        return 1 / self._interval
+
+    @property
+    def burst(self) -> int:
+        """Return the number of requests sent at once after a quiet period."""
+        return round(self._tolerance / self._interval) + 1
+
+    @property
+    def paused(self) -> bool:
+        """Return whether the host asked to be left alone for now."""
+        return time.monotonic() < self._paused_until
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the sustained rate (requests per second) and the burst size."""
+        self._interval = 1 / rate
+        self._tolerance = self._interval * (burst - 1)
+
+    def pause(self, seconds: float) -> None:
+        """Stop sending requests to the host for a while."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # One request right after the pause, the rest at the sustained rate
+        self._tat = self._paused_until + self._tolerance
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            send_at = max(start, self._tat - self._tolerance)
+            self._tat = max(self._tat, send_at) + self._interval
+            if send_at <= now:
+                return
+            await asyncio.sleep(send_at - now)
+            # Slots reserved before a 429 paused the host are given up
+            if not self.paused:
+                return
+
+
+def get_governor(host: str, rate: float, burst: int) -> HostGovernor:
+    """Return the governor of a host, creating it with the given limits."""
+    governor = _GOVERNORS.get(host)
+    if governor is None:
+        governor = _GOVERNORS[host] = HostGovernor(rate, burst)
+    return governor
@@ -1,12 +1,21 @@
 """Helper functions for entity configuration."""
 
+from collections.abc import Mapping
+from functools import cache
 from pathlib import Path
+from typing import Any
 
 import yaml
 
 
+@cache
 def load_entity_configs() -> dict:
-    """Load entity configurations from YAML."""
+    """Load entity configurations from YAML, parsed once and shared by callers."""
     config_dir = Path(__file__).parent / "config"
     with (config_dir / "entities.yaml").open(encoding="utf-8") as f:
         return yaml.safe_load(f)["entities"]
+
+
+def get_entry_config(data: Mapping[str, Any], options: Mapping[str, Any]) -> dict:
+    """Merge config entry data with the options that override it."""
+    return {**data, **options}
@@ -0,0 +1,81 @@
+"""Parameter encoding of parameterized commands for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from . import utils
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Mapping
+
+# Dates of a century, weeks, months and years stay well below this
+MAX_CACHED_COMMANDS = 65536
+
+
+def _compile_parameter(
+    parameter: Mapping[str, Any], patterns: Mapping[str, Mapping[str, Any]]
+) -> tuple[str, Callable[[Any], str], re.Pattern[str]]:
+    """Return the name, encoder and validator of a parameter."""
+    name = parameter["name"]
+    pattern = patterns[parameter["pattern"]]
+    encoder = getattr(utils, pattern["encode_method"])
+    return name, encoder, re.compile(pattern["validation"])
+
+
+class CommandTemplate:
+    """Command of an operation, rendered with encoded and validated parameters."""
+
+    def __init__(
+        self,
+        command: str,
+        parameters: list[Mapping[str, Any]],
+        patterns: Mapping[str, Mapping[str, Any]],
+    ) -> None:
+        """Resolve the encoders and compile the validators once."""
+        self.command = command
+        self._parameters = tuple(
+            _compile_parameter(parameter, patterns) for parameter in parameters
+        )
+        self._names = frozenset(name for name, _, _ in self._parameters)
+        # The parameter domain is bounded, so rendered commands are kept
+        self._render_cached = lru_cache(maxsize=MAX_CACHED_COMMANDS)(self._render)
+
+    @property
+    def cache_info(self) -> Any:
+        """Return statistics of the rendered command cache."""
+        return self._render_cached.cache_info()
+
+    def render(self, **params: Any) -> str:
+        """Return the command for raw or already encoded parameter values."""
+        if not self._parameters and not params:
+            return self.command
+        if params.keys() != self._names:
+            error_message = (
+                f"Command {self.command} takes parameters {sorted(self._names)}, "
+                f"got {sorted(params)}"
+            )
+            raise ValueError(error_message)
+
+        values = tuple(params[name] for name, _, _ in self._parameters)
+        try:
+            hash(values)
+        except TypeError:
+            # Unhashable values are rendered without the cache
+            return self._render(values)
+        return self._render_cached(values)
+
+    def _render(self, values: tuple[Hashable, ...]) -> str:
+        """Encode, validate and insert parameter values."""
+        encoded = {}
+        for (name, encoder, validator), value in zip(
+            self._parameters, values, strict=True
+        ):
+            text = value.upper() if isinstance(value, str) else encoder(value)
+            if validator.fullmatch(text) is None:
+                error_message = f"Invalid value {value!r} for parameter {name}"
+                raise ValueError(error_message)
+            encoded[name] = text
+        return self.command.format(**encoded)
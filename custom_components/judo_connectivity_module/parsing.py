@@ -0,0 +1,67 @@
+"""Response body parsing for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import binascii
+import json
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+json_loads = orjson.loads if orjson is not None else json.loads
+
+# {"data": "<hex>"} or a plain hex body
+HEX_BODY = re.compile(
+    rb'\s*(?:\{\s*"data"\s*:\s*"([0-9A-Fa-f]*)"\s*\}|([0-9A-Fa-f]*))\s*'
+)
+
+
+def _parse_hex_body(body: bytes) -> tuple[dict[str, Any], bytes] | None:
+    """Slice the hex payload out of a body without decoding the body to text."""
+    match = HEX_BODY.fullmatch(body)
+    if match is None:
+        return None
+    group = 1 if match.start(1) >= 0 else 2
+    payload = memoryview(body)[match.start(group) : match.end(group)]
+    try:
+        raw = binascii.unhexlify(payload)
+    except binascii.Error:
+        return None
+    return {"data": str(payload, "ascii")}, raw
+
+
+def parse_response(body: bytes) -> tuple[Any, bytes | None]:
+    """
+    Parse a response body into its JSON value and the raw payload bytes.
+
+    The body is read as bytes once and the hex payload is converted to bytes
+    once, so decoders never parse hex strings again. orjson parses the bytes
+    directly when installed; without it, the usual {"data": "<hex>"} bodies are
+    sliced in place instead of being decoded to text and parsed as JSON.
+    """
+    if orjson is None and (parsed := _parse_hex_body(body)) is not None:
+        return parsed
+
+    try:
+        result = json_loads(body)
+    except ValueError:
+        result = None
+    if not isinstance(result, dict):
+        # Plain text bodies
+        return _parse_hex_body(body) or (
+            {"data": body.strip().decode(errors="replace")},
+            None,
+        )
+
+    data = result.get("data")
+    if isinstance(data, str):
+        try:
+            return result, binascii.unhexlify(data)
+        except binascii.Error:
+            pass
+    return result, None
@@ -0,0 +1,69 @@
+"""Capability-driven poll plans for judo_connectivity_module."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .api import OPERATIONS
+from .const import LOGGER
+from .helpers import load_entity_configs
+from .statistics import DEFAULT_MAX_CONCURRENT_REQUESTS
+
+# Load device specifications
+API_SPEC_DIR = Path(__file__).parent / "api_spec"
+DEVICES = yaml.safe_load((API_SPEC_DIR / "devices.yaml").open(encoding="utf-8"))[
+    "device_types"
+]
+
+OPERATION_NAMES = frozenset(operation["name"] for operation in OPERATIONS)
+
+
+@dataclass(frozen=True)
+class PollPlan:
+    """Entities created and operations polled for one device type."""
+
+    device_type: str | None
+    # (key, entity config) pairs in entities.yaml order
+    sensors: tuple[tuple[str, dict[str, Any]], ...]
+    buttons: tuple[tuple[str, dict[str, Any]], ...]
+    # Operations requested on every poll cycle
+    operations: tuple[str, ...]
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+
+
+@cache
+def get_poll_plan(device_type: str | None) -> PollPlan:
+    """Return the poll plan of a device type, computed once per type."""
+    device = DEVICES.get(device_type)
+    if device is None:
+        # Without a capability list everything is tried, as before detection
+        LOGGER.warning(
+            "Unknown device type %s, using all entities", device_type or "unknown"
+        )
+        capabilities = None
+        device = {}
+    else:
+        capabilities = frozenset(device.get("capabilities", ()))
+
+    entities = [
+        (key, config)
+        for key, config in load_entity_configs().items()
+        if capabilities is None or key in capabilities
+    ]
+    sensors = tuple(item for item in entities if item[1].get("type") == "sensor")
+    buttons = tuple(item for item in entities if item[1].get("type") == "button")
+
+    return PollPlan(
+        device_type=device_type,
+        sensors=sensors,
+        buttons=buttons,
+        operations=tuple(key for key, _ in sensors if key in OPERATION_NAMES),
+        max_concurrent_requests=device.get(
+            "max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+    )
@@ -0,0 +1,116 @@
+"""Poll cycle profiling for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+from datetime import UTC, datetime
+from typing import Any, ClassVar
+
+STAGE_REQUEST = "request"
+STAGE_JSON_PARSE = "json_parse"
+STAGE_DECODE = "decode"
+STAGE_COORDINATOR_UPDATE = "coordinator_update"
+STAGE_ENTITY_WRITES = "entity_writes"
+
+# Number of functions listed in the cProfile part of a report
+PROFILE_TOP_FUNCTIONS = 40
+
+
+class ProfilerBusyError(Exception):
+    """Another poll cycle profiler is running in this process."""
+
+
+class PollCycleProfiler:
+    """Collect cProfile statistics and stage timings over a number of poll cycles."""
+
+    # cProfile profiles the whole interpreter and allows one active profile,
+    # so only one profiler runs per process at a time
+    _running: ClassVar[PollCycleProfiler | None] = None
+
+    def __init__(self, cycles: int) -> None:
+        """Initialize."""
+        self.cycles = cycles
+        self.completed = 0
+        self._started = datetime.now(UTC)
+        self._profile = cProfile.Profile()
+        self._spans: dict[str, list[float]] = {}
+        # Nested enable() calls while collecting, 0 while not collecting
+        self._depth = 0
+        # Stages run without cProfile because another profiling tool was active
+        self.unprofiled = 0
+
+    @property
+    def finished(self) -> bool:
+        """Return whether all requested cycles were profiled."""
+        return self.completed >= self.cycles
+
+    def start(self) -> None:
+        """Become the running profiler of the process."""
+        if PollCycleProfiler._running not in (None, self):
+            error_message = "Poll cycles of another config entry are being profiled"
+            raise ProfilerBusyError(error_message)
+        PollCycleProfiler._running = self
+
+    def stop(self) -> None:
+        """Stop being the running profiler of the process."""
+        self.disable()
+        if PollCycleProfiler._running is self:
+            PollCycleProfiler._running = None
+
+    def enable(self) -> None:
+        """Start collecting cProfile statistics."""
+        if self._depth:
+            # A stage inside another one, already collecting
+            self._depth += 1
+            return
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Another profiling tool is active, only stage timings are recorded
+            self.unprofiled += 1
+            return
+        self._depth = 1
+
+    def disable(self) -> None:
+        """Stop collecting cProfile statistics."""
+        if not self._depth:
+            return
+        self._depth -= 1
+        if not self._depth:
+            self._profile.disable()
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record the wall-clock duration of one stage execution."""
+        self._spans.setdefault(stage, []).append(seconds)
+
+    def report(self) -> dict[str, Any]:
+        """Return stage timings and the most expensive functions."""
+        stats_output = io.StringIO()
+        try:
+            stats = pstats.Stats(self._profile, stream=stats_output)
+        except TypeError:
+            # Nothing was collected
+            profile = ""
+        else:
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                PROFILE_TOP_FUNCTIONS
+            )
+            profile = stats_output.getvalue()
+
+        return {
+            "started": self._started.isoformat(),
+            "cycles": self.completed,
+            "unprofiled_stages": self.unprofiled,
+            "stages": {
+                stage: {
+                    "count": len(durations),
+                    "total_ms": round(sum(durations) * 1000, 3),
+                    "mean_ms": round(sum(durations) / len(durations) * 1000, 3),
+                    "max_ms": round(max(durations) * 1000, 3),
+                }
+                for stage, durations in self._spans.items()
+            },
+            "profile": profile,
+        }
@@ -0,0 +1,128 @@
+"""Per-host request priority queue for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+# Lower values are sent first
+PRIORITY_INTERACTIVE = 0  # commands of buttons and services, a user is waiting
+PRIORITY_ROUTINE = 1  # poll cycles
+PRIORITY_BULK = 2  # statistics and history fetches
+PRIORITIES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "routine": PRIORITY_ROUTINE,
+    "bulk": PRIORITY_BULK,
+}
+
+# One queue per host, alive as long as a client talking to the host is
+_QUEUES: weakref.WeakValueDictionary[str, RequestQueue] = weakref.WeakValueDictionary()
+
+
+class RequestQueue:
+    """
+    Limits the requests on the wire to one host and orders the waiting ones.
+
+    Waiting requests are sent by priority, in arrival order within a priority.
+    Every ``aging`` seconds of waiting lifts a request one priority, up to
+    routine, so bulk fetches still progress while polls keep arriving.
+    Interactive requests always go first.
+    """
+
+    def __init__(self, concurrency: int, aging: float) -> None:
+        """Initialize."""
+        self.concurrency = concurrency
+        self.aging = aging
+        self._active = 0
+        # Arrival time and wake-up future of waiting requests, per priority
+        self._waiting = tuple(
+            deque[tuple[float, asyncio.Future[None]]]() for _ in PRIORITIES
+        )
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return sum(len(queue) for queue in self._waiting)
+
+    def configure(self, concurrency: int) -> None:
+        """Change the number of requests on the wire at once."""
+        self.concurrency = concurrency
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_ROUTINE) -> AsyncIterator[None]:
+        """Hold one of the host's request slots."""
+        await self._async_acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Wait for a free slot."""
+        if self._active < self.concurrency and not self.waiting:
+            self._active += 1
+            return
+        entry = (time.monotonic(), asyncio.get_running_loop().create_future())
+        queue = self._waiting[priority]
+        queue.append(entry)
+        # Slots may be free with only cancelled requests waiting
+        self._wake()
+        try:
+            await entry[1]
+        except asyncio.CancelledError:
+            if entry[1].done() and not entry[1].cancelled():
+                # The slot was granted right before the cancellation
+                self._release()
+            else:
+                with contextlib.suppress(ValueError):
+                    queue.remove(entry)
+            raise
+
+    def _release(self) -> None:
+        """Give a slot back."""
+        self._active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to the next requests."""
+        while self._active < self.concurrency and (future := self._next()):
+            self._active += 1
+            future.set_result(None)
+
+    def _next(self) -> asyncio.Future[None] | None:
+        """Remove and return the request to send next."""
+        now = time.monotonic()
+        best: tuple[tuple[int, float], deque] | None = None
+        for priority, queue in enumerate(self._waiting):
+            # Cancelled requests leave the queue once their task resumes
+            while queue and queue[0][1].done():
+                queue.popleft()
+            if not queue:
+                continue
+            # Queues are in arrival order, the head waited longest
+            arrived = queue[0][0]
+            rank = priority
+            if priority > PRIORITY_ROUTINE:
+                rank = max(
+                    priority - int((now - arrived) / self.aging), PRIORITY_ROUTINE
+                )
+            if best is None or (rank, arrived) < best[0]:
+                best = ((rank, arrived), queue)
+        return None if best is None else best[1].popleft()[1]
+
+
+def get_request_queue(host: str, concurrency: int, aging: float) -> RequestQueue:
+    """Return the request queue of a host, creating it with the given settings."""
+    queue = _QUEUES.get(host)
+    if queue is None:
+        queue = _QUEUES[host] = RequestQueue(concurrency, aging)
+    return queue
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
 )
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
 
 from .entity import JudoConnectivityModuleEntity
-from .helpers import load_entity_configs
+from .poll_plan import get_poll_plan
+from .write_policy import WritePolicy
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -27,6 +34,7 @@ class JudoConnectivityModuleSensor(JudoConnectivityModuleEntity, SensorEntity):
         self,
         coordinator: JudoConnectivityModuleDataUpdateCoordinator,
         entity_description: SensorEntityDescription,
+        write_policy: WritePolicy | None = None,
     ) -> None:
         """Initialize the sensor class."""
         super().__init__(coordinator)
@@ -34,6 +42,50 @@ class JudoConnectivityModuleSensor(JudoConnectivityModuleEntity, SensorEntity):
         self._attr_unique_id = (
             f"{coordinator.config_entry.entry_id}_{entity_description.key}"
         )
+        self._write_policy = write_policy
+        # Value, availability and monotonic time of the last state write
+        self._written: tuple[Any, bool, float] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start the heartbeat of the write policy, which does not wait for polls."""
+        await super().async_added_to_hass()
+        policy = self._write_policy
+        if policy is not None and policy.max_interval is not None:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_heartbeat,
+                    timedelta(seconds=policy.max_interval),
+                )
+            )
+
+    @callback
+    def _async_heartbeat(self, _now: datetime) -> None:
+        """Write the state again if it was not written for max_interval."""
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the write policy of the sensor asks for it."""
+        policy = self._write_policy
+        if policy is None:
+            super()._handle_coordinator_update()
+            return
+
+        value, available, now = self.native_value, self.available, time.monotonic()
+        if (written := self._written) is not None and written[1] == available:
+            elapsed = now - written[2]
+            if not available or not policy.should_write(value, written[0], elapsed):
+                return
+        self._written = (value, available, now)
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return whether the value was fetched at least once."""
+        return (
+            super().available and self.entity_description.key in self.coordinator.data
+        )
 
     @property
     def native_value(self) -> str | None:
@@ -47,18 +99,13 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    entity_configs = load_entity_configs()
-
-    # Filter for sensor entities
-    sensor_entities = [
-        (key, config)
-        for key, config in entity_configs.items()
-        if config.get("type") == "sensor"
-    ]
+    coordinator = entry.runtime_data.coordinator
+    # Only entities the detected device type supports
+    plan = coordinator.poll_plan or get_poll_plan(None)
 
     async_add_entities(
         JudoConnectivityModuleSensor(
-            coordinator=entry.runtime_data.coordinator,
+            coordinator=coordinator,
             entity_description=SensorEntityDescription(
                 key=key,
                 name=config["name"],
@@ -67,6 +114,7 @@ async def async_setup_entry(
                 native_unit_of_measurement=config.get("unit"),
                 state_class=config.get("state_class"),
             ),
+            write_policy=WritePolicy.from_config(config.get("write_policy")),
         )
-        for key, config in sensor_entities
+        for key, config in plan.sensors
     )
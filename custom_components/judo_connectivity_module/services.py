@@ -0,0 +1,258 @@
+"""Services for judo_connectivity_module."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .cassette import CassetteRecorder
+from .const import DOMAIN, LOGGER
+from .coordinator import OPERATION_ERRORS
+from .export import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMATS,
+    MAX_CHUNK_SIZE,
+    async_iter_export_chunks,
+)
+from .profiler import ProfilerBusyError
+from .statistics import RESOLUTION_3_HOURLY, RESOLUTIONS
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import JudoConnectivityModuleConfigEntry
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_FORMAT = "format"
+ATTR_CHUNK_SIZE = "chunk_size"
+ATTR_FILENAME = "filename"
+ATTR_CYCLES = "cycles"
+ATTR_RESOLUTION = "resolution"
+ATTR_DURATION = "duration"
+
+SERVICE_EXPORT_HISTORY = "export_history"
+SERVICE_PROFILE_POLL_CYCLES = "profile_poll_cycles"
+SERVICE_RECORD_TRAFFIC = "record_traffic"
+SERVICE_QUERY_CONSUMPTION = "query_consumption"
+
+MAX_PROFILED_CYCLES = 100
+DEFAULT_RECORDING_DURATION = 600  # seconds
+MAX_RECORDING_DURATION = 86400  # seconds
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.date,
+        vol.Required(ATTR_END): cv.date,
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_CSV): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_CHUNK_SIZE, default=DEFAULT_CHUNK_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_CHUNK_SIZE)
+        ),
+        vol.Optional(ATTR_RESOLUTION, default=RESOLUTION_3_HOURLY): vol.In(RESOLUTIONS),
+    }
+)
+
+PROFILE_POLL_CYCLES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILED_CYCLES)
+        ),
+    }
+)
+
+QUERY_CONSUMPTION_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Required(ATTR_END): cv.datetime,
+    }
+)
+
+RECORD_TRAFFIC_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_DURATION, default=DEFAULT_RECORDING_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_RECORDING_DURATION)
+        ),
+    }
+)
+
+
+def async_get_loaded_entry(
+    hass: HomeAssistant, entry_id: str
+) -> JudoConnectivityModuleConfigEntry:
+    """Return a loaded config entry of this integration or raise."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        error_message = f"Config entry {entry_id} not found"
+        raise ServiceValidationError(error_message)
+    if entry.state is not ConfigEntryState.LOADED:
+        error_message = f"Config entry {entry_id} is not loaded"
+        raise ServiceValidationError(error_message)
+    return entry
+
+
+def _get_allowed_path(hass: HomeAssistant, filename: str) -> Path:
+    """Return the path of a file the services may write or raise."""
+    path = Path(hass.config.path(filename))
+    if not hass.config.is_allowed_path(str(path)):
+        error_message = f"Writing to {path} is not allowed"
+        raise ServiceValidationError(error_message)
+    return path
+
+
+async def _async_export_history(call: ServiceCall) -> ServiceResponse:
+    """Stream the consumption history of a device into a file."""
+    hass = call.hass
+    entry = async_get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    start = call.data[ATTR_START]
+    end = call.data[ATTR_END]
+    if start > end:
+        error_message = "Start date must not be after end date"
+        raise ServiceValidationError(error_message)
+
+    path = _get_allowed_path(hass, call.data[ATTR_FILENAME])
+    file = await hass.async_add_executor_job(partial(path.open, "w", encoding="utf-8"))
+    try:
+        async for chunk in async_iter_export_chunks(
+            entry.runtime_data.statistics,
+            start,
+            end,
+            call.data[ATTR_FORMAT],
+            call.data[ATTR_CHUNK_SIZE],
+            call.data[ATTR_RESOLUTION],
+        ):
+            await hass.async_add_executor_job(file.write, chunk)
+    except OPERATION_ERRORS as exception:
+        error_message = f"Export failed: {exception}"
+        raise HomeAssistantError(error_message) from exception
+    finally:
+        await hass.async_add_executor_job(file.close)
+
+    return {"path": str(path)}
+
+
+def _device_time(value: datetime) -> datetime:
+    """Return a time as wall-clock time of the device."""
+    if value.tzinfo is not None:
+        value = dt_util.as_local(value)
+    return value.replace(tzinfo=None)
+
+
+async def _async_query_consumption(call: ServiceCall) -> ServiceResponse:
+    """Return the consumption of a device between two times."""
+    entry = async_get_loaded_entry(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    start = _device_time(call.data[ATTR_START])
+    end = _device_time(call.data[ATTR_END])
+    if start > end:
+        error_message = "Start must not be after end"
+        raise ServiceValidationError(error_message)
+
+    statistics = entry.runtime_data.statistics
+    try:
+        total = await statistics.async_total(start, end)
+        days = await statistics.async_daily(
+            start.date(), (end - timedelta(microseconds=1)).date()
+        )
+    except OPERATION_ERRORS as exception:
+        error_message = f"Query failed: {exception}"
+        raise HomeAssistantError(error_message) from exception
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        # None when the device has no statistics covering the range
+        "total": total,
+        "days": [
+            {"date": day.isoformat(), "consumption": value} for day, value in days
+        ],
+    }
+
+
+async def _async_profile_poll_cycles(call: ServiceCall) -> None:
+    """Profile the next poll cycles of a device."""
+    entry = async_get_loaded_entry(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    coordinator = entry.runtime_data.coordinator
+    if coordinator.profiling:
+        error_message = f"Config entry {entry.entry_id} is already being profiled"
+        raise ServiceValidationError(error_message)
+
+    try:
+        coordinator.async_start_profiling(call.data[ATTR_CYCLES])
+    except ProfilerBusyError as exception:
+        raise ServiceValidationError(str(exception)) from exception
+    # Start the first profiled cycle now instead of waiting for the next poll
+    await coordinator.async_request_refresh()
+
+
+async def _async_record_traffic(call: ServiceCall) -> None:
+    """Record the traffic of a device to a cassette file for a while."""
+    hass = call.hass
+    entry = async_get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    path = _get_allowed_path(hass, call.data[ATTR_FILENAME])
+    client = entry.runtime_data.client
+    if client.recorder is not None:
+        error_message = f"Traffic of config entry {entry.entry_id} is already recorded"
+        raise ServiceValidationError(error_message)
+
+    recorder = client.recorder = CassetteRecorder(client.hostname)
+
+    async def _async_save_recording(_now: datetime) -> None:
+        """Stop recording and write the cassette."""
+        if client.recorder is recorder:
+            client.recorder = None
+        await hass.async_add_executor_job(recorder.save, path)
+        LOGGER.info("Recorded %s requests to %s", len(recorder.entries), path)
+
+    # Unloading the entry drops an unfinished recording
+    entry.async_on_unload(
+        async_call_later(hass, call.data[ATTR_DURATION], _async_save_recording)
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of this integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        _async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_CONSUMPTION,
+        _async_query_consumption,
+        schema=QUERY_CONSUMPTION_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_POLL_CYCLES,
+        _async_profile_poll_cycles,
+        schema=PROFILE_POLL_CYCLES_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRAFFIC,
+        _async_record_traffic,
+        schema=RECORD_TRAFFIC_SCHEMA,
+    )
@@ -0,0 +1,355 @@
+"""Statistics fetch planning for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import asyncio
+import calendar
+import time
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta, tzinfo
+from typing import TYPE_CHECKING, Any
+
+from .const import LOGGER
+from .consumption_index import ConsumptionIndex
+from .utils import (
+    encode_hex_date,
+    encode_hex_month,
+    encode_hex_week,
+    encode_hex_year,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .api import JudoConnectivityModuleApiClient
+
+# Resolutions of the statistics series, read_daily_statistics has 3-hour values
+RESOLUTION_3_HOURLY = "3_hourly"
+RESOLUTION_DAILY = "daily"
+RESOLUTION_MONTHLY = "monthly"
+RESOLUTIONS = [RESOLUTION_3_HOURLY, RESOLUTION_DAILY, RESOLUTION_MONTHLY]
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 1
+# Values of read_daily_statistics, each covering three hours
+BUCKETS_PER_DAY = 8
+BUCKET_LENGTH = timedelta(days=1) / BUCKETS_PER_DAY
+
+ONE_DAY = timedelta(days=1)
+LITERS_PER_CUBIC_METER = 1000
+
+
+@dataclass(frozen=True)
+class StatisticsRequest:
+    """A statistics command and the days it is used for."""
+
+    operation: str
+    params: tuple[tuple[str, str], ...]
+    # Period the device reports on
+    period_start: date
+    period_end: date
+    # Days of the period taken from this request
+    first: date
+    last: date
+
+    @property
+    def key(self) -> str:
+        """Return a key identifying the period, week and month numbers carry no year."""
+        return f"{self.operation}_{self.period_start.isoformat()}"
+
+    def is_closed(self, today: date) -> bool:
+        """Return whether the period is over and its values can no longer change."""
+        return self.period_end < today
+
+
+def _day_request(day: date) -> StatisticsRequest:
+    """Return the request for the 3-hour values of one day."""
+    return StatisticsRequest(
+        "read_daily_statistics",
+        (("date", encode_hex_date(day)),),
+        day,
+        day,
+        day,
+        day,
+    )
+
+
+def _week_request(day: date) -> StatisticsRequest:
+    """Return the request for the daily values of the week containing a day."""
+    monday = day - timedelta(days=day.weekday())
+    sunday = monday + timedelta(days=6)
+    return StatisticsRequest(
+        "read_weekly_statistics",
+        (("week", encode_hex_week(day.isocalendar().week)),),
+        monday,
+        sunday,
+        day,
+        sunday,
+    )
+
+
+def _month_request(day: date) -> StatisticsRequest:
+    """Return the request for the daily values of the month containing a day."""
+    first = day.replace(day=1)
+    last = day.replace(day=calendar.monthrange(day.year, day.month)[1])
+    return StatisticsRequest(
+        "read_monthly_statistics",
+        (("month", encode_hex_month(day.month)),),
+        first,
+        last,
+        day,
+        last,
+    )
+
+
+def _year_request(day: date) -> StatisticsRequest:
+    """Return the request for the monthly values of the year containing a day."""
+    last = date(day.year, 12, 31)
+    return StatisticsRequest(
+        "read_yearly_statistics",
+        (("year", encode_hex_year(day.year)),),
+        date(day.year, 1, 1),
+        last,
+        day,
+        last,
+    )
+
+
+def _daily_candidates(day: date, today: date) -> list[StatisticsRequest]:
+    """Return the requests able to provide daily values for a day."""
+    candidates = [_day_request(day)]
+    # Week and month numbers carry no year, the device answers for the current one
+    if day.year == today.year:
+        candidates.append(_month_request(day))
+        week = _week_request(day)
+        if week.period_start.year == week.period_end.year == today.year:
+            candidates.append(week)
+    return candidates
+
+
+def plan_statistics_requests(
+    start: date,
+    end: date,
+    resolution: str,
+    today: date,
+    cached: Iterable[str] = (),
+) -> list[StatisticsRequest]:
+    """Return the fewest statistics requests covering [start, end] at a resolution."""
+    if resolution not in RESOLUTIONS:
+        error_message = f"Unsupported resolution: {resolution}"
+        raise ValueError(error_message)
+
+    cached = set(cached)
+    end = min(end, today)
+    plan: list[StatisticsRequest] = []
+    day = start
+    while day <= end:
+        if resolution == RESOLUTION_3_HOURLY:
+            request = _day_request(day)
+        elif resolution == RESOLUTION_MONTHLY:
+            request = _year_request(day)
+        else:
+            # Covering points on a line with intervals: from the first uncovered
+            # day, the candidate reaching furthest is optimal. Cached requests
+            # cost no round-trip and are taken first.
+            request = max(
+                _daily_candidates(day, today),
+                key=lambda candidate: (candidate.key in cached, candidate.last),
+            )
+        request = StatisticsRequest(
+            request.operation,
+            request.params,
+            request.period_start,
+            request.period_end,
+            day,
+            min(request.last, end),
+        )
+        plan.append(request)
+        day = request.last + ONE_DAY
+    return plan
+
+
+def _rows(
+    request: StatisticsRequest,
+    values: list[float],
+    resolution: str,
+    time_zone: tzinfo,
+) -> list[tuple[datetime, float]]:
+    """Return the (interval start, m³) rows a request contributes."""
+    # The device counts in its wall-clock time, the time zone says where it is
+    if request.operation == "read_yearly_statistics":
+        return [
+            (datetime(request.period_start.year, month, 1, tzinfo=time_zone), value)
+            for month, value in enumerate(values, start=1)
+            if request.first.month <= month <= request.last.month
+        ]
+
+    midnight = datetime.combine(request.period_start, datetime.min.time(), time_zone)
+    if request.operation == "read_daily_statistics":
+        if resolution == RESOLUTION_DAILY:
+            # Values are whole liters, summed as such to avoid float noise
+            liters = sum(round(value * LITERS_PER_CUBIC_METER) for value in values)
+            return [(midnight, liters / LITERS_PER_CUBIC_METER)]
+        step = ONE_DAY / len(values)
+        return [(midnight + step * index, value) for index, value in enumerate(values)]
+
+    offset = (request.first - request.period_start).days
+    length = (request.last - request.first).days + 1
+    return [
+        (midnight + ONE_DAY * index, values[index])
+        for index in range(offset, min(offset + length, len(values)))
+    ]
+
+
+def _local_today() -> date:
+    """Return the local date of the host."""
+    return date(*time.localtime()[:3])
+
+
+class StatisticsFetcher:
+    """Fetch consumption statistics with planned, cached and bounded requests."""
+
+    def __init__(
+        self,
+        client: JudoConnectivityModuleApiClient,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        today: Callable[[], date] | None = None,
+        time_zone: tzinfo = UTC,
+    ) -> None:
+        """Initialize."""
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._today = today or self._device_today
+        # Time zone of the device clock, the rows are labelled with it
+        self._time_zone = time_zone
+        # Series of periods that are over, keyed by command
+        self._closed: dict[str, list[float]] = {}
+        # Consumption of the days and months that are over
+        self.index = ConsumptionIndex()
+        # Day and number of its buckets added to the index by async_ingest_closed
+        self._ingested: tuple[date, int] | None = None
+
+    def _device_today(self) -> date:
+        """Return the current date on the device."""
+        device_time = self._client.device_clock.now()
+        return device_time.date() if device_time is not None else _local_today()
+
+    def plan(self, start: date, end: date, resolution: str) -> list[StatisticsRequest]:
+        """Return the requests needed for a range, including cached ones."""
+        return plan_statistics_requests(
+            start, end, resolution, self._today(), self._closed
+        )
+
+    async def async_fetch(
+        self, start: date, end: date, resolution: str
+    ) -> list[tuple[datetime, float]]:
+        """Return (interval start, m³) rows for [start, end] at a resolution."""
+        today = self._today()
+        plan = plan_statistics_requests(start, end, resolution, today, self._closed)
+        series = await asyncio.gather(
+            *(self._async_request(request, today) for request in plan)
+        )
+
+        rows: list[tuple[datetime, float]] = []
+        for request, values in zip(plan, series, strict=True):
+            if values:
+                self._index_series(request, values, today)
+                rows.extend(_rows(request, values, resolution, self._time_zone))
+        return rows
+
+    async def async_total(self, start: datetime, end: datetime) -> float | None:
+        """Return the consumption in [start, end) in m³, fetching what is missing."""
+        total = self.index.total(start, end)
+        if total is None:
+            # Whole days are covered by daily values, anything else needs buckets
+            midnight = datetime.min.time()
+            resolution = (
+                RESOLUTION_DAILY
+                if start.time() == end.time() == midnight
+                else RESOLUTION_3_HOURLY
+            )
+            last = (end - timedelta(microseconds=1)).date()
+            await self.async_fetch(start.date(), last, resolution)
+            total = self.index.total(start, end)
+        return total
+
+    async def async_daily(
+        self, start: date, end: date
+    ) -> list[tuple[date, float | None]]:
+        """Return the consumption of each day in [start, end], fetching gaps."""
+        rows = self.index.daily(start, end)
+        if any(value is None for _, value in rows):
+            await self.async_fetch(start, end, RESOLUTION_DAILY)
+            rows = self.index.daily(start, end)
+        return rows
+
+    async def async_ingest_closed(self, device_time: datetime) -> int:
+        """
+        Add buckets closed since the last call to the index.
+
+        A day is read once for every bucket that closed, and the day before
+        once more if its last bucket was not added yet. Returns the number of
+        requests sent.
+        """
+        today = device_time.date()
+        midnight = datetime.combine(today, datetime.min.time(), device_time.tzinfo)
+        closed = (device_time - midnight) // BUCKET_LENGTH
+        requests = 0
+
+        if self._ingested is not None and self._ingested[0] < today:
+            day, count = self._ingested
+            if day == today - ONE_DAY and count < BUCKETS_PER_DAY:
+                await self._async_ingest_day(day, BUCKETS_PER_DAY, today)
+                requests += 1
+            self._ingested = (today, 0)
+        if self._ingested is None or self._ingested[1] < closed:
+            if closed:
+                await self._async_ingest_day(today, closed, today)
+                requests += 1
+            self._ingested = (today, closed)
+        return requests
+
+    async def _async_ingest_day(self, day: date, closed: int, today: date) -> None:
+        """Read the buckets of a day and add the closed ones to the index."""
+        request = _day_request(day)
+        values = await self._async_request(request, today)
+        if values:
+            open_buckets: list[float | None] = [None] * (len(values) - closed)
+            self.index.add_buckets(day, values[:closed] + open_buckets)
+
+    def _index_series(
+        self, request: StatisticsRequest, values: list[float], today: date
+    ) -> None:
+        """Add the values of a series for periods that are over to the index."""
+        start = request.period_start
+        if request.operation == "read_daily_statistics":
+            if start < today:
+                self.index.add_buckets(start, values)
+        elif request.operation == "read_yearly_statistics":
+            for month, value in enumerate(values, start=1):
+                if (start.year, month) < (today.year, today.month):
+                    self.index.add_month(start.year, month, value)
+        else:
+            for offset, value in enumerate(values):
+                day = start + ONE_DAY * offset
+                if day > request.period_end or day >= today:
+                    break
+                self.index.add_day(day, value)
+
+    async def _async_request(
+        self, request: StatisticsRequest, today: date
+    ) -> list[float] | None:
+        """Return the series of a request from the cache or the device."""
+        if (values := self._closed.get(request.key)) is not None:
+            return values
+
+        async with self._semaphore:
+            method = getattr(self._client, f"async_{request.operation}")
+            result: dict[str, Any] = await method(**dict(request.params))
+
+        values = result.get("decoded")
+        if not isinstance(values, list) or not values:
+            LOGGER.warning("No statistics available for %s", request.key)
+            return None
+        if request.is_closed(today):
+            self._closed[request.key] = values
+        return values
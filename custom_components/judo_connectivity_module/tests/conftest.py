@@ -1,7 +1,8 @@
 """Common test fixtures for JUDO Connectivity Module."""
 
-from asyncio import AbstractEventLoop
-from pathlib import Path
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock
 
 import aiohttp
@@ -11,6 +12,33 @@ from homeassistant.core import HomeAssistant
 from custom_components.judo_connectivity_module.api import (
     JudoConnectivityModuleApiClient,
 )
+from custom_components.judo_connectivity_module.governor import _GOVERNORS
+from custom_components.judo_connectivity_module.poll_plan import get_poll_plan
+from custom_components.judo_connectivity_module.request_queue import _QUEUES
+
+from .simulator import ClientFactory, SimulatedDevice, SimulatedSession
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+    from collections.abc import Iterator
+    from pathlib import Path
+
+SIMULATED_HOST = "judo.local"
+
+
+def _clear_registries() -> None:
+    """Drop poll plans and the per-host governors and request queues."""
+    get_poll_plan.cache_clear()
+    _GOVERNORS.clear()
+    _QUEUES.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_registries() -> Iterator[None]:
+    """Keep poll plans and per-host state of one test out of the others."""
+    _clear_registries()
+    yield
+    _clear_registries()
 
 
 @pytest.fixture(name="mock_session")
@@ -30,6 +58,30 @@ def setup_api_client(mock_session: AsyncMock) -> JudoConnectivityModuleApiClient
     )
 
 
+@pytest.fixture(name="simulated_client")
+def setup_simulated_client() -> ClientFactory:
+    """Fixture creating API clients for a simulated device behind judo.local."""
+
+    def _create(
+        device: SimulatedDevice | None = None,
+        *,
+        session: Any = None,
+        **kwargs: Any,
+    ) -> JudoConnectivityModuleApiClient:
+        if session is None:
+            session = SimulatedSession({SIMULATED_HOST: device or SimulatedDevice()})
+        return JudoConnectivityModuleApiClient(
+            SIMULATED_HOST,
+            "admin",
+            "Connectivity",
+            session,
+            # Only the simulated latency slows tests down, not the request pacing
+            **{"rate_limit": 1000, "burst": 100, **kwargs},
+        )
+
+    return _create
+
+
 @pytest.fixture
 def hass(event_loop: AbstractEventLoop, tmp_path: Path) -> HomeAssistant:
     """Fixture for Home Assistant instance."""
@@ -0,0 +1,133 @@
+"""Config entry harness setting up the integration against simulated devices."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+
+from custom_components.judo_connectivity_module import (
+    async_setup_entry,
+    async_unload_entry,
+    button,
+    sensor,
+)
+from custom_components.judo_connectivity_module.const import (
+    CONF_BURST,
+    CONF_RATE_LIMIT,
+    DOMAIN,
+)
+
+from .simulator import SimulatedSession
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity import Entity
+
+
+class EntryHarness:
+    """Set up config entries against simulated devices without a full core."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.session = SimulatedSession()
+        self.entities: dict[str, list[Entity]] = {}
+        hass.config_entries = MagicMock()
+        hass.config_entries.async_forward_entry_setups = (
+            self._async_forward_entry_setups
+        )
+        hass.config_entries.async_unload_platforms = self._async_unload_platforms
+        hass.config_entries.async_reload = self._async_reload
+        self._entries: dict[str, config_entries.ConfigEntry] = {}
+
+    def create_entry(self, index: int) -> config_entries.ConfigEntry:
+        """Create a config entry for a new simulated device."""
+        host = f"10.0.{index // 256}.{index % 256}"
+        self.session.add_device(host)
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title=f"PROM-i-SAFE {index}",
+            data={
+                CONF_HOST: host,
+                CONF_USERNAME: "admin",
+                CONF_PASSWORD: "Connectivity",
+                # Measure the integration, not the pacing of requests to devices
+                CONF_RATE_LIMIT: 1000,
+                CONF_BURST: 100,
+            },
+            source=config_entries.SOURCE_USER,
+            options={},
+            unique_id=None,
+        )
+        self._entries[entry.entry_id] = entry
+        return entry
+
+    async def _async_forward_entry_setups(
+        self, entry: config_entries.ConfigEntry, _platforms: Iterable[str]
+    ) -> None:
+        """Set up the platforms, collecting their entities."""
+        entities = self.entities.setdefault(entry.entry_id, [])
+        for platform in (sensor, button):
+            await platform.async_setup_entry(self.hass, entry, entities.extend)
+
+    async def _async_unload_platforms(
+        self, entry: config_entries.ConfigEntry, _platforms: Iterable[str]
+    ) -> bool:
+        """Drop the entities of an entry."""
+        self.entities.pop(entry.entry_id, None)
+        return True
+
+    async def async_setup(self, entry: config_entries.ConfigEntry) -> None:
+        """Set up an entry the way the config entries manager does."""
+        config_entries.current_entry.set(entry)
+        assert await async_setup_entry(self.hass, entry)
+
+    async def async_unload(self, entry: config_entries.ConfigEntry) -> None:
+        """Unload an entry the way the config entries manager does."""
+        assert await async_unload_entry(self.hass, entry)
+        await entry._async_process_on_unload(self.hass)  # noqa: SLF001
+        entry.runtime_data = None
+
+    async def _async_reload(self, entry_id: str) -> bool:
+        """Reload an entry the way the config entries manager does."""
+        entry = self._entries[entry_id]
+        await self.async_unload(entry)
+        await self.async_setup(entry)
+        return True
+
+    async def async_reload(self, entry: config_entries.ConfigEntry) -> None:
+        """Fully reload an entry."""
+        assert await self.hass.config_entries.async_reload(entry.entry_id)
+
+    @contextmanager
+    def serving(self) -> Iterator[None]:
+        """Serve the integration's HTTP session from the simulated devices."""
+        # Plain callables instead of mocks so no call history is retained
+        with (
+            patch(
+                "custom_components.judo_connectivity_module.async_get_clientsession",
+                new=lambda _hass: self.session,
+            ),
+            patch(
+                "custom_components.judo_connectivity_module.async_get_loaded_integration",
+                new=lambda _hass, _domain: None,
+            ),
+        ):
+            yield
+
+    async def async_update_options(
+        self, entry: config_entries.ConfigEntry, options: dict[str, Any]
+    ) -> None:
+        """Update the options of an entry and notify its update listeners."""
+        object.__setattr__(entry, "options", MappingProxyType(options))
+        for listener in entry.update_listeners:
+            await listener(self.hass, entry)
@@ -0,0 +1,152 @@
+"""Simulated JUDO devices for offline tests and benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+import yarl
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from custom_components.judo_connectivity_module.api import (
+    JudoConnectivityModuleApiClient,
+)
+
+HTTP_OK = 200
+HTTP_BAD_REQUEST = 400
+HTTP_NOT_FOUND = 404
+HTTP_INTERNAL_SERVER_ERROR = 500
+HTTP_TOO_MANY_REQUESTS = 429
+
+# Sample responses of a PROM-i-SAFE, keyed by command
+DEFAULT_RESPONSES = {
+    "FF00": "44",
+    "0600": "0774ed0b",
+    "2800": "40420F00",
+    "0E00": "6414CB7B",
+    "0100": "661301",
+    "5900": "1c04170e041e",
+}
+# Parameterized commands answer with a fixed payload regardless of parameters
+DEFAULT_PREFIX_RESPONSES = {
+    "FB": "E8030000" * 8,
+    "FC": "10270000" * 7,
+    "FD": "10270000" * 31,
+    "FE": "A0860100" * 12,
+}
+# Commands without a response body
+WRITE_COMMANDS = {"6300", "5100", "5200", "5400", "5500", "5700", "5800"}
+
+# Creates clients for a simulated device, see the simulated_client fixture
+ClientFactory = Callable[..., JudoConnectivityModuleApiClient]
+
+
+@dataclass
+class SimulatedDevice:
+    """A JUDO device answering REST commands from canned responses."""
+
+    responses: dict[str, str] = field(default_factory=lambda: dict(DEFAULT_RESPONSES))
+    prefix_responses: dict[str, str] = field(
+        default_factory=lambda: dict(DEFAULT_PREFIX_RESPONSES)
+    )
+    latency: float = 0.0
+    requests: Counter[str] = field(default_factory=Counter)
+    # Number of upcoming requests answered with 429 and the Retry-After sent
+    rate_limited: int = 0
+    retry_after: str | None = None
+    # Number of upcoming requests of a command answered with 500
+    failures: Counter[str] = field(default_factory=Counter)
+    # Status returned for rejected commands, by command or by its first byte
+    rejected: dict[str, int] = field(default_factory=dict)
+    # Transport error raised instead of answering the next request of a command
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    def respond(self, command: str) -> tuple[int, bytes]:
+        """Return status and body for a command."""
+        self.requests[command] += 1
+        if (error := self.errors.pop(command, None)) is not None:
+            raise error
+        if self.rate_limited:
+            self.rate_limited -= 1
+            return HTTP_TOO_MANY_REQUESTS, b""
+        if self.failures[command]:
+            self.failures[command] -= 1
+            return HTTP_INTERNAL_SERVER_ERROR, b""
+        status = self.rejected.get(command) or self.rejected.get(command[:2])
+        if status is not None:
+            return status, b""
+        if command in WRITE_COMMANDS:
+            return HTTP_OK, b"{}"
+        data = self.responses.get(command) or self.prefix_responses.get(command[:2])
+        if data is None:
+            return HTTP_NOT_FOUND, b""
+        return HTTP_OK, json.dumps({"data": data}).encode()
+
+
+class SimulatedResponse:
+    """Minimal stand-in for aiohttp.ClientResponse."""
+
+    def __init__(
+        self,
+        url: str,
+        status: int,
+        body: bytes,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Initialize."""
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+        self.request_info = aiohttp.RequestInfo(
+            yarl.URL(url), "GET", CIMultiDictProxy(CIMultiDict())
+        )
+        self.history = ()
+        self.released = False
+        self._body = body
+
+    async def read(self) -> bytes:
+        """Return the response body, which hands the connection back."""
+        self.released = True
+        return self._body
+
+    async def text(self) -> str:
+        """Return the response body as text."""
+        return self._body.decode()
+
+    def release(self) -> None:
+        """Hand the connection back without reading the body."""
+        self.released = True
+
+
+class SimulatedSession:
+    """Minimal stand-in for aiohttp.ClientSession routing to simulated devices."""
+
+    def __init__(self, devices: dict[str, SimulatedDevice] | None = None) -> None:
+        """Initialize."""
+        self.devices = devices if devices is not None else {}
+        # Every response returned, to check their connections were handed back
+        self.responses: list[SimulatedResponse] = []
+
+    def add_device(self, host: str, device: SimulatedDevice | None = None) -> None:
+        """Add a device reachable under a host name."""
+        self.devices[host] = device or SimulatedDevice()
+
+    async def get(self, url: str, **_kwargs: Any) -> SimulatedResponse:
+        """Answer a GET request from the device behind the host."""
+        # http://<host>/api/rest/<command>
+        _, _, host, _ = url.split("/", 3)
+        device = self.devices[host]
+        if device.latency:
+            await asyncio.sleep(device.latency)
+        status, body = device.respond(url.rsplit("/", 1)[-1])
+        headers = {}
+        if status == HTTP_TOO_MANY_REQUESTS and device.retry_after is not None:
+            headers["Retry-After"] = device.retry_after
+        response = SimulatedResponse(url, status, body, headers)
+        self.responses.append(response)
+        return response
@@ -0,0 +1,87 @@
+"""Tests for polling aligned to the device clock."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.judo_connectivity_module.coordinator import (
+    JudoConnectivityModuleDataUpdateCoordinator,
+)
+from custom_components.judo_connectivity_module.statistics import StatisticsFetcher
+
+from .simulator import ClientFactory, SimulatedDevice
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+DAY = date(2024, 6, 15)
+
+
+def _at(hour: int, minute: int = 1, day: date = DAY) -> datetime:
+    """Return a time of the device clock."""
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_closed_buckets_are_read_once(simulated_client: ClientFactory) -> None:
+    """Test a day is read only when one of its buckets closed."""
+    device = SimulatedDevice()
+    statistics = StatisticsFetcher(simulated_client(device), today=lambda: DAY)
+
+    polls = [_at(hour) for hour in range(24)] + [_at(0, day=DAY + timedelta(days=1))]
+    requests = [await statistics.async_ingest_closed(time) for time in polls]
+
+    # Every third hour a bucket closes, the last one with the next day
+    assert requests == [0, 0, 0] + [1, 0, 0] * 7 + [1]
+    # The 15th is read for the buckets closed during the day and once when over
+    assert list(device.requests.values()) == [8]
+    assert statistics.index.daily(DAY, DAY + timedelta(days=1)) == [
+        (DAY, 8.0),
+        (DAY + timedelta(days=1), None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_open_buckets_are_not_indexed(simulated_client: ClientFactory) -> None:
+    """Test buckets still open on the device stay out of the index."""
+    statistics = StatisticsFetcher(
+        simulated_client(SimulatedDevice()), today=lambda: DAY
+    )
+
+    await statistics.async_ingest_closed(_at(7))
+
+    assert statistics.index.total(_at(0, 0), _at(6, 0)) == 2.0
+    assert statistics.index.total(_at(0, 0), _at(9, 0)) is None
+
+
+@pytest.mark.asyncio
+async def test_aligned_polls_follow_device_hours(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test polls are scheduled just after the next hour of the device."""
+    hass = HomeAssistant(str(tmp_path))
+    client = simulated_client(SimulatedDevice())
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(hass, client)
+    client.device_clock.sync(_at(10, 20))
+
+    coordinator.aligned = True
+    delay = coordinator._aligned_delay()  # noqa: SLF001
+    assert delay == pytest.approx(41 * 60, abs=1)
+
+    client.device_clock.sync(_at(11, 0) + timedelta(seconds=30))
+    delay = coordinator._aligned_delay()  # noqa: SLF001
+    assert delay == pytest.approx(30, abs=1)
+
+    # Each poll sets the interval the coordinator schedules the next one with
+    await coordinator.async_refresh()
+    assert coordinator.update_interval.total_seconds() == pytest.approx(30, abs=1)
+
+    # Without alignment the configured interval applies again
+    coordinator.aligned = False
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == coordinator.scan_interval
+    await hass.async_stop(force=True)
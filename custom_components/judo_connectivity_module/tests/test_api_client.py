@@ -1,6 +1,7 @@
 """Tests for JUDO Connectivity Module API client."""
 
-from unittest.mock import AsyncMock
+import asyncio
+from unittest.mock import AsyncMock, patch
 
 import aiohttp
 import pytest
@@ -24,7 +25,7 @@ async def test_get_device_type(
     """Test getting device type."""
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_response.text.return_value = '{"data": "44"}'
+    mock_response.read.return_value = b'{"data": "44"}'
 
     mock_session.get = AsyncMock(return_value=mock_response)
 
@@ -35,3 +36,181 @@ async def test_get_device_type(
         "http://192.168.1.100/api/rest/FF00",
         auth=aiohttp.BasicAuth("admin", "password"),
     )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_commands_share_request(
+    api_client: JudoConnectivityModuleApiClient, mock_session: AsyncMock
+) -> None:
+    """Test concurrent identical commands are sent once."""
+    release = asyncio.Event()
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read.return_value = b'{"data": "E8030000"}'
+
+    async def slow_get(*_args: object, **_kwargs: object) -> AsyncMock:
+        await release.wait()
+        return mock_response
+
+    mock_session.get = AsyncMock(side_effect=slow_get)
+
+    tasks = [asyncio.create_task(api_client.async_read_datetime()) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert mock_session.get.await_count == 1
+    assert results[0] is results[1] is results[2]
+
+
+@pytest.mark.asyncio
+async def test_responses_cached_for_declared_ttl(
+    api_client: JudoConnectivityModuleApiClient, mock_session: AsyncMock
+) -> None:
+    """Test cache_ttl from operations.yaml is honored."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read.return_value = b'{"data": "40420F00"}'
+    mock_session.get = AsyncMock(return_value=mock_response)
+
+    # Only the clock of the response cache, request pacing keeps the real one
+    with patch("custom_components.judo_connectivity_module.api.time") as clock:
+        monotonic = clock.monotonic
+        monotonic.return_value = 100.0
+        await api_client.async_read_total_water()
+        await api_client.async_read_total_water()
+        await api_client.async_read_serial_number()
+        assert mock_session.get.await_count == 2
+
+        # read_total_water expires after a few seconds, the serial number never
+        monotonic.return_value = 200.0
+        await api_client.async_read_total_water()
+        await api_client.async_read_serial_number()
+        assert mock_session.get.await_count == 3
+
+        api_client.invalidate_cache()
+        await api_client.async_read_serial_number()
+        assert mock_session.get.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_commands_without_response_are_not_shared(
+    api_client: JudoConnectivityModuleApiClient, mock_session: AsyncMock
+) -> None:
+    """Test state changing commands always reach the device."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read.return_value = b"{}"
+    mock_session.get = AsyncMock(return_value=mock_response)
+
+    await asyncio.gather(
+        api_client.async_leak_protection_activate(),
+        api_client.async_leak_protection_activate(),
+    )
+
+    assert mock_session.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_device_time_served_from_local_clock(
+    api_client: JudoConnectivityModuleApiClient, mock_session: AsyncMock
+) -> None:
+    """Test read_datetime only reaches the device to re-sync its clock."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read.return_value = b'{"data": "1c04170e041e"}'
+    mock_session.get = AsyncMock(return_value=mock_response)
+
+    with patch("custom_components.judo_connectivity_module.clock.time") as clock:
+        monotonic = clock.monotonic
+        monotonic.return_value = 1000.0
+        first = await api_client.async_read_datetime()
+
+        monotonic.return_value = 1060.0
+        second = await api_client.async_read_datetime()
+
+    assert mock_session.get.await_count == 1
+    assert (second["decoded"] - first["decoded"]).total_seconds() == 60
+    assert second["data"] == "1C04170E051E"
+
+
+@pytest.mark.asyncio
+async def test_update_transport_drops_cache(
+    api_client: JudoConnectivityModuleApiClient, mock_session: AsyncMock
+) -> None:
+    """Test switching host keeps the session but not the cached responses."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read.return_value = b'{"data": "0774ed0b"}'
+    mock_session.get = AsyncMock(return_value=mock_response)
+
+    await api_client.async_read_serial_number()
+    api_client.update_transport("192.168.1.101", "admin", "secret")
+    await api_client.async_read_serial_number()
+
+    assert api_client.hostname == "192.168.1.101"
+    mock_session.get.assert_called_with(
+        "http://192.168.1.101/api/rest/0600",
+        auth=aiohttp.BasicAuth("admin", "secret"),
+    )
+    assert mock_session.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_cancel_shared_request(
+    api_client: JudoConnectivityModuleApiClient, mock_session: AsyncMock
+) -> None:
+    """Test a shared request is cancelled once all of its callers are."""
+    release = asyncio.Event()
+
+    async def slow_get(*_args: object, **_kwargs: object) -> None:
+        await release.wait()
+
+    mock_session.get = AsyncMock(side_effect=slow_get)
+
+    tasks = [asyncio.create_task(api_client.async_read_datetime()) for _ in range(2)]
+    await asyncio.sleep(0)
+    tasks[0].cancel()
+    await asyncio.sleep(0)
+    assert api_client._inflight  # noqa: SLF001
+    tasks[1].cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert not api_client._inflight  # noqa: SLF001
+    assert mock_session.get.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_update_transport_detaches_inflight_requests(
+    api_client: JudoConnectivityModuleApiClient, mock_session: AsyncMock
+) -> None:
+    """Test callers after a host change do not join a request to the old host."""
+    release = asyncio.Event()
+    old_response = AsyncMock()
+    old_response.status = 200
+    old_response.read.return_value = b'{"data": "0774ed0b"}'
+    new_response = AsyncMock()
+    new_response.status = 200
+    new_response.read.return_value = b'{"data": "0874ed0b"}'
+
+    async def get(url: str, **_kwargs: object) -> AsyncMock:
+        if "192.168.1.100" in url:
+            await release.wait()
+            return old_response
+        return new_response
+
+    mock_session.get = AsyncMock(side_effect=get)
+
+    old = asyncio.create_task(api_client.async_read_serial_number())
+    await asyncio.sleep(0)
+    api_client.update_transport("192.168.1.101", "admin", "secret")
+    new = await api_client.async_read_serial_number()
+    release.set()
+    await old
+
+    assert new["data"] == "0874ed0b"
+    assert not api_client._inflight  # noqa: SLF001
+    # The late response of the old host is not cached for the new one
+    assert (await api_client.async_read_serial_number())["data"] == "0874ed0b"
+    assert mock_session.get.await_count == 2
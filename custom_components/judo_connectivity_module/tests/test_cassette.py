@@ -0,0 +1,129 @@
+"""Tests for traffic recording and replay."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from custom_components.judo_connectivity_module.cassette import (
+    CassetteMissError,
+    CassetteRecorder,
+    CassetteSession,
+    load_cassette,
+)
+
+from .simulator import ClientFactory, SimulatedDevice
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from custom_components.judo_connectivity_module.api import (
+        JudoConnectivityModuleApiClient,
+    )
+
+LATENCY = 0.02
+
+
+async def _poll(client: JudoConnectivityModuleApiClient) -> list[Any]:
+    """Request a few values the way a poll cycle does."""
+    return [
+        (await client.async_get_device_type())["decoded"],
+        (await client.async_read_total_water())["decoded"],
+        (await client.async_read_software_version())["decoded"],
+    ]
+
+
+async def _record_cassette(tmp_path: Path, simulated_client: ClientFactory) -> Path:
+    """Record a poll cycle of a device with a 429 on the way."""
+    device = SimulatedDevice(latency=LATENCY, rate_limited=1, retry_after="0")
+    client = simulated_client(device)
+    client.recorder = CassetteRecorder(client.hostname)
+    await _poll(client)
+
+    path = tmp_path / "traffic.jsonl.gz"
+    client.recorder.save(path)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_cassette_file(tmp_path: Path, simulated_client: ClientFactory) -> None:
+    """Test each exchange is recorded with its timing."""
+    cassette = await _record_cassette(tmp_path, simulated_client)
+    header, entries = load_cassette(cassette)
+
+    assert header["host"] == "judo.local"
+    assert [(entry["c"], entry["s"]) for entry in entries] == [
+        ("FF00", 429),
+        ("FF00", 200),
+        ("2800", 200),
+        ("0100", 200),
+    ]
+    assert entries[0]["h"] == {"Retry-After": "0"}
+    assert all(entry["d"] >= LATENCY for entry in entries)
+    assert entries[1]["b"] == '{"data": "44"}'
+
+
+@pytest.mark.asyncio
+async def test_replay_fast(tmp_path: Path, simulated_client: ClientFactory) -> None:
+    """Test a replay returns the recorded responses without delay."""
+    cassette = await _record_cassette(tmp_path, simulated_client)
+    session = CassetteSession.from_file(cassette, realtime=False)
+    client = simulated_client(session=session)
+
+    started = time.monotonic()
+    values = await _poll(client)
+
+    assert values == [68, 1000.0, "1.19f"]
+    assert time.monotonic() - started < LATENCY * 4
+    # The recording ran out, the last response of a command is repeated
+    assert (await client.async_read_total_water())["decoded"] == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_replay_realtime(tmp_path: Path, simulated_client: ClientFactory) -> None:
+    """Test a realtime replay takes as long as the device did."""
+    cassette = await _record_cassette(tmp_path, simulated_client)
+    client = simulated_client(session=CassetteSession.from_file(cassette))
+
+    started = time.monotonic()
+    await _poll(client)
+
+    assert time.monotonic() - started >= LATENCY * 4
+
+
+@pytest.mark.asyncio
+async def test_replay_miss(tmp_path: Path, simulated_client: ClientFactory) -> None:
+    """Test requests that were never recorded fail like a lost connection."""
+    cassette = await _record_cassette(tmp_path, simulated_client)
+    client = simulated_client(
+        session=CassetteSession.from_file(cassette, realtime=False)
+    )
+
+    with pytest.raises(CassetteMissError):
+        await client.async_read_serial_number()
+
+
+@pytest.mark.asyncio
+async def test_failed_exchanges_are_replayed(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test requests failing without a response are recorded and raised again."""
+    device = SimulatedDevice(latency=LATENCY, errors={"2800": TimeoutError()})
+    client = simulated_client(device)
+    client.recorder = CassetteRecorder(client.hostname)
+    with pytest.raises(TimeoutError):
+        await client.async_read_total_water()
+    await client.async_read_total_water()
+    path = tmp_path / "traffic.jsonl.gz"
+    client.recorder.save(path)
+
+    _, entries = load_cassette(path)
+    assert entries[0]["e"] == "TimeoutError"
+    assert entries[0]["d"] >= LATENCY
+    assert "s" not in entries[0]
+    client = simulated_client(session=CassetteSession.from_file(path, realtime=False))
+    with pytest.raises(TimeoutError):
+        await client.async_read_total_water()
+    assert (await client.async_read_total_water())["decoded"] == 1000.0
@@ -0,0 +1,71 @@
+"""Tests for JUDO Connectivity Module device clock prediction."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.judo_connectivity_module.clock import DeviceClock, next_boundary
+
+START = datetime(2023, 8, 13, 12, 0, 0, tzinfo=UTC)
+
+
+def test_unsynchronized_clock_needs_sync() -> None:
+    """Test a clock without readings asks for one."""
+    clock = DeviceClock()
+    assert clock.needs_sync(0.0)
+    assert clock.now(0.0) is None
+
+
+def test_prediction_between_reads() -> None:
+    """Test device time advances locally after a reading."""
+    clock = DeviceClock(resync_threshold=5.0, drift_bound=100e-6)
+    clock.sync(START, monotonic=0.0)
+
+    assert clock.now(90.0) == START + timedelta(seconds=90)
+    assert not clock.needs_sync(3600.0)
+    # 1s resolution + 100ppm of 40000s exceeds the 5s threshold
+    assert clock.needs_sync(41000.0)
+
+
+def test_drift_is_measured() -> None:
+    """Test a second reading measures drift and relaxes re-syncs."""
+    clock = DeviceClock(resync_threshold=5.0, drift_bound=100e-6)
+    clock.sync(START, monotonic=0.0)
+    # The device clock runs 4 seconds fast over 40000 seconds
+    clock.sync(START + timedelta(seconds=40004), monotonic=40000.0)
+
+    assert round(clock.drift, 6) == 0.0001
+    predicted = clock.now(50000.0)
+    assert abs((predicted - (START + timedelta(seconds=50005))).total_seconds()) < 0.01
+    assert not clock.needs_sync(40000.0 + 60000.0)
+
+
+def test_clock_jump_resets_drift() -> None:
+    """Test a reading far off the prediction discards the drift estimate."""
+    clock = DeviceClock(resync_threshold=5.0)
+    clock.sync(START, monotonic=0.0)
+    clock.sync(START + timedelta(seconds=40004), monotonic=40000.0)
+
+    clock.sync(START + timedelta(hours=13), monotonic=41000.0)
+
+    assert clock.drift == 0.0
+    assert clock.now(41010.0) == START + timedelta(hours=13, seconds=10)
+
+
+def test_next_boundary() -> None:
+    """Test boundaries are multiples of the period since midnight."""
+    hour = timedelta(hours=1)
+    assert next_boundary(START + timedelta(minutes=20), hour) == START + hour
+    assert next_boundary(START, hour) == START + hour
+    assert next_boundary(START.replace(hour=23, minute=59), hour) == datetime(
+        2023, 8, 14, tzinfo=UTC
+    )
+
+
+def test_seconds_until_follows_drift() -> None:
+    """Test local waits are shortened for a device clock running fast."""
+    clock = DeviceClock()
+    assert clock.seconds_until(START) is None
+    clock.sync(START, monotonic=0.0)
+    clock.sync(START + timedelta(seconds=40004), monotonic=40000.0)
+
+    target = START + timedelta(seconds=40004 + 10001)
+    assert round(clock.seconds_until(target, monotonic=40000.0) or 0, 3) == 10000.0
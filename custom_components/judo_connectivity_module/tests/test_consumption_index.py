@@ -0,0 +1,133 @@
+"""Tests for the cumulative consumption index."""
+
+from datetime import UTC, date, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.judo_connectivity_module import services
+from custom_components.judo_connectivity_module.consumption_index import (
+    ConsumptionIndex,
+)
+from custom_components.judo_connectivity_module.services import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END,
+    ATTR_START,
+)
+from custom_components.judo_connectivity_module.statistics import StatisticsFetcher
+
+from .simulator import ClientFactory, SimulatedDevice
+
+TODAY = date(2024, 6, 15)
+
+
+def _at(*args: int) -> datetime:
+    """Return a wall-clock time of the device."""
+    return datetime(*args, tzinfo=UTC)  # type: ignore[misc]
+
+
+def _index() -> ConsumptionIndex:
+    """Return an index of May 2024 as days and of 1 June as 3-hour buckets."""
+    index = ConsumptionIndex()
+    for day in range(1, 32):
+        index.add_day(date(2024, 5, day), float(day))
+    index.add_buckets(date(2024, 6, 1), [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0])
+    index.add_month(2024, 4, 100.0)
+    return index
+
+
+def test_total_within_a_day() -> None:
+    """Test ranges on bucket boundaries are summed from the buckets."""
+    index = _index()
+
+    assert index.total(_at(2024, 6, 1, 3), _at(2024, 6, 1, 9)) == 5.0
+    assert index.total(_at(2024, 6, 1), _at(2024, 6, 2)) == 36.0
+    # Boundaries inside a bucket and days without buckets are not indexed
+    assert index.total(_at(2024, 6, 1, 4), _at(2024, 6, 1, 9)) is None
+    assert index.total(_at(2024, 5, 3, 3), _at(2024, 5, 3, 6)) is None
+
+
+def test_total_across_days_and_months() -> None:
+    """Test day and month rollups answer longer ranges."""
+    index = _index()
+
+    # Complete buckets roll up into their day, complete days into their month
+    assert index.total(_at(2024, 5, 30), _at(2024, 6, 2)) == 97.0
+    assert index.total(_at(2024, 4, 1), _at(2024, 6, 1, 6)) == 599.0
+    assert index.total(_at(2024, 5, 31, 12), _at(2024, 6, 1)) is None
+    assert index.total(_at(2024, 3, 31), _at(2024, 5, 2)) is None
+    with pytest.raises(ValueError, match="Start"):
+        index.total(_at(2024, 6, 2), _at(2024, 6, 1))
+
+
+def test_reported_totals_win_over_rollups() -> None:
+    """Test totals reported by the device are kept once buckets complete."""
+    index = ConsumptionIndex()
+    index.add_day(date(2024, 6, 1), 40.0)
+    index.add_buckets(date(2024, 6, 1), [5.0, 5.0, None, 5.0, 5.0, 5.0, 5.0, 5.0])
+    index.add_buckets(date(2024, 6, 1), [None, None, 5.0, None, None, None, None, 5.0])
+
+    assert index.total(_at(2024, 6, 1), _at(2024, 6, 1, 12)) == 20.0
+    assert index.daily(date(2024, 6, 1), date(2024, 6, 2)) == [
+        (date(2024, 6, 1), 40.0),
+        (date(2024, 6, 2), None),
+    ]
+
+
+def test_out_of_order_months() -> None:
+    """Test months may be added in any order."""
+    index = ConsumptionIndex()
+    index.add_month(2024, 3, 3.0)
+    index.add_month(2023, 12, 12.0)
+    index.add_month(2024, 1, 1.0)
+
+    assert index.total(_at(2024, 1, 1), _at(2024, 4, 1)) is None
+    index.add_month(2024, 2, 2.0)
+    assert index.total(_at(2023, 12, 1), _at(2024, 4, 1)) == 18.0
+
+
+@pytest.mark.asyncio
+async def test_fetcher_indexes_closed_periods(simulated_client: ClientFactory) -> None:
+    """Test fetched statistics answer later queries without requests."""
+    device = SimulatedDevice()
+    client = simulated_client(device)
+    statistics = StatisticsFetcher(client, today=lambda: TODAY)
+
+    total = await statistics.async_total(_at(2024, 6, 3), _at(2024, 6, 8))
+    assert total == 50.0
+    # The open month only provides the days that are over
+    assert await statistics.async_total(_at(2024, 6, 3), _at(2024, 6, 16)) is None
+    hours = await statistics.async_total(_at(2024, 6, 3, 6), _at(2024, 6, 3, 12))
+    assert hours == 2.0
+    requests = sum(device.requests.values())
+
+    assert await statistics.async_total(_at(2024, 6, 3), _at(2024, 6, 8)) == total
+    assert await statistics.async_daily(date(2024, 6, 3), date(2024, 6, 4)) == [
+        (date(2024, 6, 3), 10.0),
+        (date(2024, 6, 4), 10.0),
+    ]
+    assert sum(device.requests.values()) == requests
+
+
+@pytest.mark.asyncio
+async def test_query_reports_transport_errors() -> None:
+    """Test a failing request surfaces as a Home Assistant error."""
+    entry = MagicMock()
+    entry.runtime_data.statistics.async_total = AsyncMock(
+        side_effect=aiohttp.ClientError
+    )
+    call = MagicMock(
+        data={
+            ATTR_CONFIG_ENTRY_ID: "entry",
+            ATTR_START: datetime(2024, 6, 3),  # noqa: DTZ001
+            ATTR_END: datetime(2024, 6, 8),  # noqa: DTZ001
+        }
+    )
+
+    with (
+        patch.object(services, "async_get_loaded_entry", return_value=entry),
+        pytest.raises(HomeAssistantError, match="Query failed"),
+    ):
+        await services._async_query_consumption(call)  # noqa: SLF001
@@ -9,6 +9,7 @@ from custom_components.judo_connectivity_module.utils import (
     decode_timestamp,
     decode_version,
     decode_water_volume,
+    decode_water_volume_series,
     get_device_name,
 )
 
@@ -28,6 +29,13 @@ def test_decode_water_volume() -> None:
     assert decode_water_volume("80969800") == 10000.0  # 10,000,000 liters = 10000 m³
 
 
+def test_decode_water_volume_series() -> None:
+    """Test statistics series decoding."""
+    assert decode_water_volume_series("10270000" + "E8030000") == [10.0, 1.0]
+    assert decode_water_volume_series("00000000" * 8) == [0.0] * 8
+    assert decode_water_volume_series("") == []
+
+
 def test_decode_timestamp() -> None:
     """Test timestamp decoding."""
     # Test the sample timestamp from operations.yaml
@@ -66,3 +74,13 @@ def test_decode_serial_number() -> None:
 def test_get_device_name() -> None:
     """Test device name lookup."""
     assert get_device_name("68") == "PROM-i-SAFE"
+
+
+def test_decoders_accept_bytes() -> None:
+    """Test decoders take the payload bytes as well as the hex string."""
+    assert decode_hex_value(b"\x44") == decode_hex_value("44")
+    assert decode_water_volume(memoryview(b"\x40\x42\x0f\x00")) == 1000.0
+    assert decode_version(bytes.fromhex("661301")) == decode_version("661301")
+    assert decode_datetime_bytes(bytes.fromhex("1c04170e041e")) == datetime(
+        2023, 4, 28, 14, 4, 30, tzinfo=UTC
+    )
@@ -1,8 +1,13 @@
 """Tests for JUDO Connectivity Module parameter encoding."""
 
-from datetime import datetime
+from datetime import UTC, date, datetime
 
+import pytest
+
+from custom_components.judo_connectivity_module.api import COMMAND_TEMPLATES
 from custom_components.judo_connectivity_module.utils import (
+    decode_datetime_bytes,
+    encode_datetime_bytes,
     encode_hex_date,
     encode_hex_month,
     encode_hex_week,
@@ -14,7 +19,7 @@ def test_encode_date() -> None:
     """Test daily statistics date parameter encoding."""
     date = datetime.strptime("13 August 2023", "%d %B %Y")
     encoded_date = encode_hex_date(date)
-    assert encoded_date == "0D0807E7"
+    assert encoded_date == "0D0817"
 
 
 def test_encode_week() -> None:
@@ -35,4 +40,51 @@ def test_encode_year() -> None:
     """Test yearly statistics parameter encoding."""
     year = 2023
     encoded_year = encode_hex_year(year)
-    assert encoded_year == "07E7"
+    assert encoded_year == "17"
+
+
+def test_encode_datetime_bytes() -> None:
+    """Test device date and time encoding."""
+    value = datetime(2023, 4, 28, 14, 4, 30, tzinfo=UTC)
+    assert encode_datetime_bytes(value) == "1C04170E041E"
+    assert decode_datetime_bytes(encode_datetime_bytes(value)) == value
+
+
+def test_command_template_encodes_raw_and_encoded_values() -> None:
+    """Test commands accept raw values and already encoded strings."""
+    template = COMMAND_TEMPLATES["read_daily_statistics"]
+    assert template.render(date=date(2023, 8, 13)) == "FB0D0817"
+    assert template.render(date="0d0817") == "FB0D0817"
+    assert COMMAND_TEMPLATES["read_yearly_statistics"].render(year=2023) == "FE17"
+    assert COMMAND_TEMPLATES["get_device_type"].render() == "FF00"
+
+
+@pytest.mark.parametrize(
+    ("operation", "params"),
+    [
+        ("read_daily_statistics", {"date": "0D0807E7"}),
+        ("read_weekly_statistics", {"week": 300}),
+        ("read_monthly_statistics", {}),
+        ("read_monthly_statistics", {"month": 8, "year": 2023}),
+        ("get_device_type", {"week": 1}),
+    ],
+)
+def test_command_template_rejects_invalid_parameters(
+    operation: str, params: dict
+) -> None:
+    """Test parameters are validated against their declared pattern."""
+    with pytest.raises(ValueError, match="parameter"):
+        COMMAND_TEMPLATES[operation].render(**params)
+
+
+def test_command_template_renders_each_command_once() -> None:
+    """Test repeated parameters are served from the command cache."""
+    template = COMMAND_TEMPLATES["read_weekly_statistics"]
+    before = template.cache_info
+    for _ in range(1000):
+        for week in range(1, 54):
+            template.render(week=week)
+
+    after = template.cache_info
+    assert after.misses - before.misses <= 53
+    assert after.hits - before.hits >= 1000 * 53 - 53
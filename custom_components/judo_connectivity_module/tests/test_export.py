@@ -0,0 +1,144 @@
+"""Tests for JUDO Connectivity Module history export."""
+
+import json
+from datetime import UTC, date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.judo_connectivity_module.export import (
+    CSV_HEADER,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+    async_iter_export_chunks,
+)
+from custom_components.judo_connectivity_module.statistics import (
+    RESOLUTION_3_HOURLY,
+    RESOLUTION_DAILY,
+    StatisticsFetcher,
+)
+from custom_components.judo_connectivity_module.websocket_api import (
+    _async_stream_export,
+)
+
+
+@pytest.fixture(name="statistics_client")
+def setup_statistics_client() -> AsyncMock:
+    """Fixture for a client returning eight 3-hour values per day."""
+    client = AsyncMock()
+    client.async_read_daily_statistics.return_value = {
+        "data": "E8030000" * 8,
+        "decoded": [1.0] * 8,
+    }
+    return client
+
+
+@pytest.fixture(name="statistics")
+def setup_statistics(statistics_client: AsyncMock) -> StatisticsFetcher:
+    """Fixture for a statistics fetcher on a device dated 2024-06-01."""
+    return StatisticsFetcher(statistics_client, today=lambda: date(2024, 6, 1))
+
+
+@pytest.mark.asyncio
+async def test_export_csv_chunks(
+    statistics: StatisticsFetcher, statistics_client: AsyncMock
+) -> None:
+    """Test CSV export is split into bounded chunks."""
+    chunks = [
+        chunk
+        async for chunk in async_iter_export_chunks(
+            statistics,
+            date(2023, 8, 13),
+            date(2023, 8, 14),
+            EXPORT_FORMAT_CSV,
+            chunk_size=5,
+        )
+    ]
+
+    assert chunks[0] == CSV_HEADER
+    rows = [line for chunk in chunks[1:] for line in chunk.splitlines()]
+    assert len(rows) == 16
+    assert all(chunk.count("\n") <= 5 for chunk in chunks[1:])
+    assert rows[0] == "2023-08-13T00:00:00+00:00,1.0"
+    assert rows[9] == "2023-08-14T03:00:00+00:00,1.0"
+    assert statistics_client.async_read_daily_statistics.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_export_fetches_lazily(
+    statistics: StatisticsFetcher, statistics_client: AsyncMock
+) -> None:
+    """Test days are only fetched when the consumer asks for them."""
+    chunks = async_iter_export_chunks(
+        statistics,
+        date(2023, 1, 1),
+        date(2023, 12, 31),
+        EXPORT_FORMAT_JSONL,
+        chunk_size=8,
+    )
+
+    first = await anext(chunks)
+    await chunks.aclose()
+
+    assert statistics_client.async_read_daily_statistics.await_count == 1
+    row = json.loads(first.splitlines()[1])
+    assert datetime.fromisoformat(row["timestamp"]) == datetime(
+        2023, 1, 1, 3, tzinfo=UTC
+    )
+    assert row["consumption"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_export_daily_resolution(
+    statistics: StatisticsFetcher, statistics_client: AsyncMock
+) -> None:
+    """Test daily rows sum the 3-hour values of past years."""
+    chunks = [
+        chunk
+        async for chunk in async_iter_export_chunks(
+            statistics,
+            date(2023, 8, 13),
+            date(2023, 8, 14),
+            EXPORT_FORMAT_CSV,
+            resolution=RESOLUTION_DAILY,
+        )
+    ]
+
+    assert chunks[1].splitlines() == [
+        "2023-08-13T00:00:00+00:00,8.0",
+        "2023-08-14T00:00:00+00:00,8.0",
+    ]
+    assert statistics_client.async_read_daily_statistics.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_format(statistics: StatisticsFetcher) -> None:
+    """Test an unsupported format raises."""
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        await anext(
+            async_iter_export_chunks(
+                statistics, date(2023, 1, 1), date(2023, 1, 1), "xml"
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_stream_export_reports_transport_errors(
+    statistics: StatisticsFetcher, statistics_client: AsyncMock
+) -> None:
+    """Test a timeout ends the export subscription with an error event."""
+    statistics_client.async_read_daily_statistics.side_effect = TimeoutError
+    connection = MagicMock()
+    msg = {
+        "id": 7,
+        "start": date(2024, 1, 1),
+        "end": date(2024, 1, 2),
+        "format": EXPORT_FORMAT_CSV,
+        "chunk_size": 10,
+        "resolution": RESOLUTION_3_HOURLY,
+    }
+
+    await _async_stream_export(connection, msg, statistics)
+
+    (event,), _ = connection.send_message.call_args
+    assert "error" in event["event"]
@@ -0,0 +1,129 @@
+"""Tests for the headless fleet poller."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from custom_components.judo_connectivity_module.fleet import (
+    FleetHost,
+    FleetPoller,
+    FleetStats,
+    parse_hosts,
+)
+
+from .simulator import SimulatedDevice, SimulatedSession
+
+FLEET_SIZE = 500
+# Simulated round trip of one request
+DEVICE_LATENCY = 0.005
+MIN_POLLS_PER_MINUTE = 5000
+FLEET_SCRIPT = Path(__file__).parents[3] / "scripts" / "fleet"
+
+
+def _fleet(size: int, **device: Any) -> tuple[SimulatedSession, list[FleetHost]]:
+    """Return a session with simulated devices and their hosts."""
+    session = SimulatedSession()
+    hosts = []
+    for index in range(size):
+        host = f"fleet-{index}.local"
+        session.add_device(host, SimulatedDevice(**device))
+        hosts.append(FleetHost(host))
+    return session, hosts
+
+
+def test_parse_hosts() -> None:
+    """Hosts may carry credentials, comments and blank lines are skipped."""
+    hosts = parse_hosts(
+        ["# kitchen", "", "10.0.0.2", "user:secret@10.0.0.3  # cellar", "me@10.0.0.4"],
+        "admin",
+        "default",
+    )
+
+    assert hosts == [
+        FleetHost("10.0.0.2", "admin", "default"),
+        FleetHost("10.0.0.3", "user", "secret"),
+        FleetHost("10.0.0.4", "me", "default"),
+    ]
+
+
+def test_latency_percentiles_stay_bounded() -> None:
+    """Percentiles are close to exact while memory does not grow with polls."""
+    stats = FleetStats()
+    for _ in range(100):
+        round_stats = FleetStats()
+        for millisecond in range(1, 1001):
+            round_stats.record(millisecond / 1000, failed=False)
+        stats.merge(round_stats)
+
+    report = stats.report()["latency_ms"]
+    assert stats.polls == 100 * 1000
+    assert len(stats.latencies) < 500
+    assert report["p50"] == pytest.approx(500, rel=0.02)
+    assert report["p99"] == pytest.approx(990, rel=0.02)
+    assert report["max"] == 1000
+
+
+def test_unknown_operation() -> None:
+    """Operations are checked before polling."""
+    with pytest.raises(ValueError, match="read_nothing"):
+        FleetPoller(SimulatedSession(), [FleetHost("a")], ["read_nothing"])  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_poll_fleet() -> None:
+    """Every device is polled once within the concurrency bound."""
+    session, hosts = _fleet(FLEET_SIZE, latency=DEVICE_LATENCY)
+    session.devices[hosts[0].host].failures["0600"] = 1
+    poller = FleetPoller(
+        session,  # type: ignore[arg-type]
+        hosts,
+        concurrency=100,
+        rate_limit=1000,
+        burst=100,
+    )
+    results: list[dict[str, Any]] = []
+
+    stats = await poller.async_poll(results.append)
+
+    assert sorted(result["host"] for result in results) == sorted(
+        host.host for host in hosts
+    )
+    assert stats.polls == FLEET_SIZE
+    assert stats.failures == 1
+    failed = next(result for result in results if result["host"] == hosts[0].host)
+    assert set(failed["errors"]) == {"read_serial_number"}
+    assert set(failed["values"]) == {
+        "get_device_type",
+        "read_software_version",
+        "read_total_water",
+    }
+    report = stats.report()
+    assert report["polls_per_minute"] > MIN_POLLS_PER_MINUTE
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+    # Results are written as JSON lines
+    assert all(json.loads(json.dumps(result)) == result for result in results)
+
+
+def test_script_without_home_assistant() -> None:
+    """The launcher runs without importing Home Assistant."""
+    code = (
+        "import runpy, sys; sys.argv = ['fleet', '--help']\n"
+        "try:\n"
+        f"    runpy.run_path({str(FLEET_SCRIPT)!r}, run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "assert not [name for name in sys.modules if name.startswith('homeassistant')]"
+    )
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, check=False, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "hosts" in result.stdout
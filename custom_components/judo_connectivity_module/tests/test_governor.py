@@ -0,0 +1,76 @@
+"""Tests for the per-host rate governor."""
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.judo_connectivity_module.api import (
+    MAX_RETRIES,
+    JudoConnectivityModuleApiClientCommunicationError,
+)
+from custom_components.judo_connectivity_module.governor import HostGovernor
+
+from .simulator import ClientFactory, SimulatedDevice, SimulatedSession
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate() -> None:
+    """Test requests beyond the burst are spread at the sustained rate."""
+    governor = HostGovernor(rate=100, burst=2)
+    assert (governor.rate, governor.burst) == (100, 2)
+
+    started = time.monotonic()
+    for _ in range(6):
+        await governor.acquire()
+
+    # Two requests from the burst, four at 10 ms intervals
+    assert time.monotonic() - started >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_clients_of_a_host_share_a_governor(
+    simulated_client: ClientFactory,
+) -> None:
+    """Test runtime and config flow clients are limited together."""
+    session = SimulatedSession()
+    session.add_device("judo.local")
+    runtime = simulated_client(session=session, rate_limit=5, burst=1)
+    flow = simulated_client(session=session, rate_limit=None, burst=None)
+
+    assert runtime._governor is flow._governor  # noqa: SLF001
+    # Clients created without limits keep the configured ones
+    assert flow._governor.rate == 5  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_request_is_retried(simulated_client: ClientFactory) -> None:
+    """Test a 429 pauses the host and queued requests succeed afterwards."""
+    device = SimulatedDevice(rate_limited=1, retry_after="0.05")
+    session = SimulatedSession({"judo.local": device})
+    client = simulated_client(session=session)
+
+    started = time.monotonic()
+    total, device_type = await asyncio.gather(
+        client.async_read_total_water(), client.async_get_device_type()
+    )
+
+    assert total["decoded"] == 1000.0
+    assert device_type["decoded"] == 68
+    assert time.monotonic() - started >= 0.05
+    assert device.requests == {"2800": 2, "FF00": 1}
+    # Connections of the 429 responses are handed back before retrying
+    assert all(response.released for response in session.responses)
+
+
+@pytest.mark.asyncio
+async def test_persistent_rate_limit_fails(simulated_client: ClientFactory) -> None:
+    """Test a request fails once the retries are used up."""
+    device = SimulatedDevice(rate_limited=MAX_RETRIES + 1, retry_after="0")
+    session = SimulatedSession({"judo.local": device})
+    client = simulated_client(session=session)
+
+    with pytest.raises(JudoConnectivityModuleApiClientCommunicationError):
+        await client.async_read_total_water()
+    assert device.requests["2800"] == MAX_RETRIES + 1
+    assert all(response.released for response in session.responses)
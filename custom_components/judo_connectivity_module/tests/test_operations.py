@@ -17,7 +17,7 @@ async def test_get_device_type(
     """Test getting device type."""
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_response.text.return_value = '{"data": "44"}'
+    mock_response.read.return_value = b'{"data": "44"}'
 
     mock_session.get = AsyncMock(return_value=mock_response)
 
@@ -37,7 +37,7 @@ async def test_dynamic_operation_call(
     """Test dynamic operation calling based on YAML specs."""
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_response.text.return_value = '{"data": "0774ed0b"}'
+    mock_response.read.return_value = b'{"data": "0774ed0b"}'
     mock_session.get = AsyncMock(return_value=mock_response)
 
     result = await api_client.async_read_serial_number()
@@ -63,7 +63,7 @@ async def test_operations_with_samples(
     mock_session.get = AsyncMock(return_value=mock_response)
 
     # Test device type
-    mock_response.text.return_value = '{"data": "44"}'
+    mock_response.read.return_value = b'{"data": "44"}'
     result = await api_client.async_get_device_type()
     assert result["data"] == "44"
     assert result["decoded"] == 68
@@ -73,7 +73,7 @@ async def test_operations_with_samples(
     )
 
     # Test serial number
-    mock_response.text.return_value = '{"data": "0774ed0b"}'
+    mock_response.read.return_value = b'{"data": "0774ed0b"}'
     result = await api_client.async_read_serial_number()
     assert result["data"] == "0774ed0b"
     assert result["decoded"] == 200111111
@@ -83,7 +83,7 @@ async def test_operations_with_samples(
     )
 
     # Test start date
-    mock_response.text.return_value = '{"data": "6414CB7B"}'
+    mock_response.read.return_value = b'{"data": "6414CB7B"}'
     result = await api_client.async_read_start_date()
     assert result["data"] == "6414CB7B"
     assert result["decoded"].isoformat() == "2023-03-17T20:20:11+00:00"
@@ -93,7 +93,7 @@ async def test_operations_with_samples(
     )
 
     # Test software version
-    mock_response.text.return_value = '{"data": "661301"}'
+    mock_response.read.return_value = b'{"data": "661301"}'
     result = await api_client.async_read_software_version()
     assert result["data"] == "661301"
     assert result["decoded"] == "1.19f"
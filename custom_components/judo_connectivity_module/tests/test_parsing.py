@@ -0,0 +1,98 @@
+"""Tests for JUDO Connectivity Module response parsing."""
+
+import json
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.judo_connectivity_module import parsing
+from custom_components.judo_connectivity_module.parsing import parse_response
+from custom_components.judo_connectivity_module.utils import (
+    decode_water_volume_series,
+)
+
+# Typical bodies: device type, total water and a month of daily statistics
+BODIES = [
+    b'{"data": "44"}',
+    b'{"data":"40420F00"}',
+    b'{"data": "' + b"10270000" * 31 + b'"}',
+]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request: pytest.FixtureRequest) -> Any:
+    """Run a test with and without the optional JSON backend."""
+    if request.param == "json":
+        with patch.multiple(
+            parsing, orjson=None, json_loads=json.loads, JSON_BACKEND="json"
+        ):
+            yield request.param
+    else:
+        pytest.importorskip("orjson")
+        yield request.param
+
+
+@pytest.mark.usefixtures("json_backend")
+@pytest.mark.parametrize(
+    ("body", "expected", "raw"),
+    [
+        (b'{"data": "44"}', {"data": "44"}, b"\x44"),
+        (b' { "data" : "0774ed0b" }\n', {"data": "0774ed0b"}, b"\x07\x74\xed\x0b"),
+        (b"44\n", {"data": "44"}, b"\x44"),
+        (b"{}", {}, None),
+        (b'{"data": "FF0"}', {"data": "FF0"}, None),
+        (b'{"data": "", "error": 1}', {"data": "", "error": 1}, b""),
+        (b"not hex", {"data": "not hex"}, None),
+    ],
+)
+def test_parse_response(body: bytes, expected: Any, raw: bytes | None) -> None:
+    """Test bodies are parsed to their JSON value and payload bytes."""
+    assert parse_response(body) == (expected, raw)
+
+
+def _legacy_parse(body: bytes) -> list[float]:
+    """Parse and decode a body the way responses were handled before."""
+    text = body.decode()
+    try:
+        result = json.loads(text)
+    except json.JSONDecodeError:
+        result = {"data": text.strip()}
+    return decode_water_volume_series(result["data"])
+
+
+def _parse(body: bytes) -> list[float]:
+    """Parse and decode a body through the bytes path."""
+    _, raw = parse_response(body)
+    return decode_water_volume_series(raw)
+
+
+def _peak_allocation(parse: Callable[[bytes], list[float]], body: bytes) -> int:
+    """Return the peak memory allocated while handling one response."""
+    parse(body)  # Warm up caches
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        parse(body)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+@pytest.mark.usefixtures("json_backend")
+def test_parse_allocations_per_response(
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Benchmark allocations per response against the text based path."""
+    for body in BODIES:
+        legacy = _peak_allocation(_legacy_parse, body)
+        current = _peak_allocation(_parse, body)
+        name = f"parsing_{parsing.JSON_BACKEND}_{len(body)}B"
+        record_property(f"{name}_text_path", legacy)
+        record_property(f"{name}_bytes_path", current)
+        assert _parse(body) == _legacy_parse(body)
+        assert current <= legacy
@@ -0,0 +1,163 @@
+"""Tests for partial poll results and retries of failed operations."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.judo_connectivity_module import coordinator as coordinator_module
+from custom_components.judo_connectivity_module.coordinator import (
+    JudoConnectivityModuleDataUpdateCoordinator,
+)
+from custom_components.judo_connectivity_module.poll_plan import (
+    DEVICES,
+)
+
+from .simulator import ClientFactory, SimulatedDevice
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CAPABILITIES = ["get_device_type", "read_total_water", "read_software_version"]
+
+
+@pytest.mark.asyncio
+async def test_failed_operation_keeps_other_values(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test a failing operation neither fails the cycle nor drops its value."""
+    hass = HomeAssistant(str(tmp_path))
+    device = SimulatedDevice()
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(
+        hass, simulated_client(device)
+    )
+    limited = {"name": "Limited", "capabilities": CAPABILITIES}
+
+    with (
+        patch.dict(DEVICES, {"68": limited}),
+        patch.object(coordinator_module, "RETRY_BACKOFF", ()),
+    ):
+        await coordinator.async_refresh()
+        first = coordinator.data
+        device.responses["2800"] = "41420F00"
+        device.failures["0100"] = 1
+        coordinator._client.invalidate_cache()  # noqa: SLF001
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data["read_total_water"]["decoded"] == 1000.001
+    assert coordinator.failed_operations.keys() == {"read_software_version"}
+    # The value of the failed operation and its timestamp are kept
+    software_version = coordinator.data["read_software_version"]
+    assert software_version == first["read_software_version"]
+    assert (
+        software_version["fetched_at"]
+        < coordinator.data["read_total_water"]["fetched_at"]
+    )
+    await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+
+
+@pytest.mark.asyncio
+async def test_only_failed_operations_are_retried(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test failed operations are requested again without a full cycle."""
+    hass = HomeAssistant(str(tmp_path))
+    device = SimulatedDevice()
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(
+        hass, simulated_client(device)
+    )
+    limited = {"name": "Limited", "capabilities": CAPABILITIES}
+    updates = []
+    coordinator.async_add_listener(lambda: updates.append(dict(coordinator.data)))
+    device.failures.update({"2800": 2})
+
+    with (
+        patch.dict(DEVICES, {"68": limited}),
+        patch.object(coordinator_module, "RETRY_BACKOFF", (0.01, 0.01, 0.01)),
+    ):
+        await coordinator.async_refresh()
+        assert "read_total_water" not in coordinator.data
+        await asyncio.sleep(0.1)
+
+    assert coordinator.data["read_total_water"]["decoded"] == 1000.0
+    assert not coordinator.failed_operations
+    # One full cycle, then two retries of the failing command only
+    assert device.requests == Counter({"FF00": 1, "2800": 3, "0100": 1})
+    assert len(updates) == 2
+    await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+
+
+@pytest.mark.asyncio
+async def test_cycle_fails_when_every_operation_fails(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test the update fails only when no operation succeeded."""
+    hass = HomeAssistant(str(tmp_path))
+    device = SimulatedDevice()
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(
+        hass, simulated_client(device)
+    )
+    # The device type is cached for the session and never fails again
+    limited = {"name": "Limited", "capabilities": CAPABILITIES[1:]}
+
+    with (
+        patch.dict(DEVICES, {"68": limited}),
+        patch.object(coordinator_module, "RETRY_BACKOFF", ()),
+    ):
+        await coordinator.async_refresh()
+        device.failures.update({"2800": 1, "0100": 1})
+        coordinator._client.invalidate_cache()  # noqa: SLF001
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert isinstance(coordinator.last_exception, UpdateFailed)
+    await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+
+
+@pytest.mark.asyncio
+async def test_retry_does_not_overwrite_newer_update(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test a retry finishing after a regular update keeps the newer values."""
+    hass = HomeAssistant(str(tmp_path))
+    device = SimulatedDevice()
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(
+        hass, simulated_client(device)
+    )
+    client = coordinator._client  # noqa: SLF001
+    limited = {"name": "Limited", "capabilities": CAPABILITIES}
+    device.failures.update({"2800": 1})
+    release = asyncio.Event()
+
+    async def _async_slow_read() -> dict:
+        await release.wait()
+        return {"data": "00000000", "decoded": 0.0}
+
+    with (
+        patch.dict(DEVICES, {"68": limited}),
+        patch.object(coordinator_module, "RETRY_BACKOFF", (60,)),
+    ):
+        await coordinator.async_refresh()
+        with patch.object(client, "async_read_total_water", _async_slow_read):
+            retry = asyncio.create_task(coordinator._async_retry_failed(None))  # noqa: SLF001
+            await asyncio.sleep(0)
+        device.responses["2800"] = "41420F00"
+        client.invalidate_cache()
+        await coordinator.async_refresh()
+        release.set()
+        await retry
+
+    assert coordinator.data["read_total_water"]["decoded"] == 1000.001
+    assert not coordinator.failed_operations
+    await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
@@ -0,0 +1,71 @@
+"""Tests for capability-driven poll plans."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.judo_connectivity_module.coordinator import (
+    JudoConnectivityModuleDataUpdateCoordinator,
+)
+from custom_components.judo_connectivity_module.helpers import load_entity_configs
+from custom_components.judo_connectivity_module.poll_plan import (
+    DEVICES,
+    get_poll_plan,
+)
+
+from .simulator import ClientFactory, SimulatedDevice
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_poll_plan_is_cached_per_device_type() -> None:
+    """Test the plan of a device type is computed once."""
+    assert get_poll_plan("68") is get_poll_plan("68")
+
+
+def test_poll_plan_follows_capabilities() -> None:
+    """Test only entities listed as capabilities are planned."""
+    limited = {"name": "Limited", "capabilities": ["get_device_type", "reset_message"]}
+    with patch.dict(DEVICES, {"99": limited}):
+        plan = get_poll_plan("99")
+
+    assert [key for key, _ in plan.sensors] == ["get_device_type"]
+    assert [key for key, _ in plan.buttons] == ["reset_message"]
+    assert plan.operations == ("get_device_type",)
+
+
+def test_unknown_device_type_uses_all_entities() -> None:
+    """Test an unknown device type falls back to every entity."""
+    plan = get_poll_plan(None)
+
+    assert len(plan.sensors) + len(plan.buttons) == len(load_entity_configs())
+
+
+@pytest.mark.asyncio
+async def test_coordinator_skips_unsupported_operations(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test operations outside the capabilities are never requested."""
+    hass = HomeAssistant(str(tmp_path))
+    device = SimulatedDevice()
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(
+        hass, simulated_client(device)
+    )
+    limited = {"name": "Limited", "capabilities": ["get_device_type"]}
+
+    with patch.dict(DEVICES, {"68": limited}):
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.poll_plan is not None
+    assert coordinator.poll_plan.device_type == "68"
+    assert set(coordinator.data) == {"get_device_type"}
+    # The device type is detected once and then served from the cache
+    assert device.requests == {"FF00": 1}
+    await hass.async_stop(force=True)
@@ -0,0 +1,113 @@
+"""Tests for poll cycle profiling."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.judo_connectivity_module.coordinator import (
+    JudoConnectivityModuleDataUpdateCoordinator,
+)
+from custom_components.judo_connectivity_module.profiler import (
+    STAGE_COORDINATOR_UPDATE,
+    STAGE_DECODE,
+    STAGE_ENTITY_WRITES,
+    STAGE_JSON_PARSE,
+    STAGE_REQUEST,
+    PollCycleProfiler,
+    ProfilerBusyError,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .simulator import ClientFactory
+
+
+@pytest.mark.asyncio
+async def test_profile_poll_cycles(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test profiling records every stage of the requested cycles."""
+    hass = HomeAssistant(str(tmp_path))
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(hass, simulated_client())
+    coordinator.async_add_listener(lambda: None)
+    coordinator.async_start_profiling(2)
+
+    await coordinator.async_refresh()
+    assert coordinator.profiling
+    await coordinator.async_refresh()
+    await asyncio.sleep(0)
+
+    assert not coordinator.profiling
+    report = coordinator.profile_report
+    assert report is not None
+    assert report["cycles"] == 2
+    assert set(report["stages"]) == {
+        STAGE_REQUEST,
+        STAGE_JSON_PARSE,
+        STAGE_DECODE,
+        STAGE_COORDINATOR_UPDATE,
+        STAGE_ENTITY_WRITES,
+    }
+    assert report["stages"][STAGE_COORDINATOR_UPDATE]["count"] == 2
+    assert "_async_fetch_data" in report["profile"]
+    await hass.async_stop(force=True)
+
+
+@pytest.mark.asyncio
+async def test_polling_without_profiler(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test nothing is recorded while profiling is disabled."""
+    hass = HomeAssistant(str(tmp_path))
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(hass, simulated_client())
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.profile_report is None
+    assert coordinator._client.profiler is None  # noqa: SLF001
+    await hass.async_stop(force=True)
+
+
+@pytest.mark.asyncio
+async def test_one_profiler_per_process(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Test poll cycles of a second entry are not profiled at the same time."""
+    hass = HomeAssistant(str(tmp_path))
+    first = JudoConnectivityModuleDataUpdateCoordinator(hass, simulated_client())
+    second = JudoConnectivityModuleDataUpdateCoordinator(hass, simulated_client())
+    first.async_start_profiling(1)
+
+    with pytest.raises(ProfilerBusyError):
+        second.async_start_profiling(1)
+    assert not second.profiling
+
+    await first.async_refresh()
+    await asyncio.sleep(0)
+    second.async_start_profiling(1)
+    assert second.profiling
+    await second.async_shutdown()
+    await first.async_shutdown()
+    await hass.async_stop(force=True)
+
+
+def test_stage_timings_without_cprofile() -> None:
+    """Test stages are still timed while another profiling tool is active."""
+    profiler = PollCycleProfiler(1)
+    profile = profiler._profile = MagicMock()  # noqa: SLF001
+    profile.enable.side_effect = ValueError("Another profiling tool is already active")
+
+    profiler.enable()
+    profiler.disable()
+    profiler.record(STAGE_COORDINATOR_UPDATE, 0.5)
+
+    assert profiler.unprofiled == 1
+    profile.disable.assert_not_called()
+    stages = profiler.report()["stages"]
+    assert stages[STAGE_COORDINATOR_UPDATE]["count"] == 1
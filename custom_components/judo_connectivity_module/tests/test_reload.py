@@ -0,0 +1,74 @@
+"""Tests for applying option changes to loaded config entries."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import CONF_HOST, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+
+from .harness import EntryHarness
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.asyncio
+async def test_host_change_detects_the_new_device(tmp_path: Path) -> None:
+    """Test a new host gets a fresh poll plan and statistics fetcher."""
+    hass = HomeAssistant(str(tmp_path))
+    harness = EntryHarness(hass)
+    entry = harness.create_entry(0)
+    harness.session.add_device("judo-new.local")
+
+    with harness.serving():
+        try:
+            await harness.async_setup(entry)
+            coordinator = entry.runtime_data.coordinator
+            previous = entry.runtime_data.statistics
+            await previous.async_daily(date(2024, 1, 1), date(2024, 1, 7))
+
+            await harness.async_update_options(
+                entry, {**entry.data, CONF_HOST: "judo-new.local"}
+            )
+
+            statistics = entry.runtime_data.statistics
+            assert entry.runtime_data.coordinator is coordinator
+            assert statistics is not previous
+            assert coordinator.statistics is statistics
+            assert statistics.index.daily(date(2024, 1, 1), date(2024, 1, 1)) == [
+                (date(2024, 1, 1), None)
+            ]
+            assert coordinator.poll_plan is not None
+            assert harness.session.devices["judo-new.local"].requests["FF00"] == 1
+            await harness.async_unload(entry)
+        finally:
+            await hass.async_stop(force=True)
+
+
+@pytest.mark.asyncio
+async def test_polling_change_keeps_update_status(tmp_path: Path) -> None:
+    """Test a new scan interval reschedules the poll without a fake update."""
+    hass = HomeAssistant(str(tmp_path))
+    harness = EntryHarness(hass)
+    entry = harness.create_entry(0)
+
+    with harness.serving():
+        try:
+            await harness.async_setup(entry)
+            coordinator = entry.runtime_data.coordinator
+            updates = []
+            coordinator.async_add_listener(lambda: updates.append(None))
+            coordinator.last_update_success = False
+
+            await harness.async_update_options(entry, {CONF_SCAN_INTERVAL: 60})
+
+            assert not coordinator.last_update_success
+            assert not updates
+            assert coordinator.update_interval == timedelta(seconds=60)
+            assert coordinator._unsub_refresh is not None  # noqa: SLF001
+            await harness.async_unload(entry)
+        finally:
+            await hass.async_stop(force=True)
@@ -0,0 +1,250 @@
+"""Tests and latency benchmarks for the per-host request priority queue."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.components.button import ButtonEntityDescription
+
+from custom_components.judo_connectivity_module.api import (
+    OPERATION_PRIORITIES,
+    JudoConnectivityModuleApiClient,
+)
+from custom_components.judo_connectivity_module.button import (
+    JudoConnectivityModuleButton,
+)
+from custom_components.judo_connectivity_module.request_queue import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_ROUTINE,
+    RequestQueue,
+    get_request_queue,
+)
+
+from .simulator import ClientFactory, SimulatedDevice, SimulatedSession
+
+# Simulated round trip of one request
+DEVICE_LATENCY = 0.01
+BACKFILL_DAYS = 365
+PRESSES = 20
+# Interactive p99 may grow by the requests already on the wire, not the backlog
+MAX_P99_GROWTH = 3 * DEVICE_LATENCY
+
+
+def _p99(latencies: list[float]) -> float:
+    """Return the 99th percentile (nearest rank)."""
+    latencies = sorted(latencies)
+    return latencies[max(round(0.99 * len(latencies)) - 1, 0)]
+
+
+async def _async_hold(queue: RequestQueue, priority: int, order: list[int]) -> None:
+    """Take a slot, note the priority and give the slot back."""
+    async with queue.slot(priority):
+        order.append(priority)
+
+
+def test_operation_priorities() -> None:
+    """Buttons are interactive, polls routine and statistics bulk."""
+    assert OPERATION_PRIORITIES["leak_protection_activate"] == PRIORITY_INTERACTIVE
+    assert OPERATION_PRIORITIES["read_total_water"] == PRIORITY_ROUTINE
+    assert OPERATION_PRIORITIES["read_daily_statistics"] == PRIORITY_BULK
+
+
+@pytest.mark.asyncio
+async def test_priority_order() -> None:
+    """Waiting requests are sent by priority, then in arrival order."""
+    queue = RequestQueue(concurrency=1, aging=60)
+    order: list[int] = []
+
+    async with queue.slot():
+        tasks = [
+            asyncio.create_task(_async_hold(queue, priority, order))
+            for priority in (PRIORITY_BULK, PRIORITY_ROUTINE, PRIORITY_INTERACTIVE)
+        ]
+        await asyncio.sleep(0)
+        assert queue.waiting == len(tasks)
+    await asyncio.gather(*tasks)
+
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_ROUTINE, PRIORITY_BULK]
+
+
+@pytest.mark.asyncio
+async def test_bulk_ages_past_routine() -> None:
+    """A bulk request that waited long enough goes before newer routine ones."""
+    queue = RequestQueue(concurrency=1, aging=0.01)
+    order: list[int] = []
+
+    async with queue.slot():
+        bulk = asyncio.create_task(_async_hold(queue, PRIORITY_BULK, order))
+        await asyncio.sleep(0.02)
+        routine = asyncio.create_task(_async_hold(queue, PRIORITY_ROUTINE, order))
+        interactive = asyncio.create_task(
+            _async_hold(queue, PRIORITY_INTERACTIVE, order)
+        )
+        await asyncio.sleep(0)
+    await asyncio.gather(bulk, routine, interactive)
+
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BULK, PRIORITY_ROUTINE]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_frees_its_place() -> None:
+    """A cancelled waiting request neither blocks nor keeps a slot."""
+    queue = RequestQueue(concurrency=1, aging=60)
+    order: list[int] = []
+
+    async with queue.slot():
+        cancelled = asyncio.create_task(_async_hold(queue, PRIORITY_INTERACTIVE, order))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    await asyncio.wait_for(_async_hold(queue, PRIORITY_BULK, order), 1)
+
+    assert order == [PRIORITY_BULK]
+    assert not queue.waiting
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_request_leaves_its_slot(
+    simulated_client: ClientFactory,
+) -> None:
+    """A request waiting out a Retry-After pause does not hold a slot."""
+    client = simulated_client(SimulatedDevice(rate_limited=1, retry_after="0.05"))
+    queue = get_request_queue(client.hostname, 1, 60)
+    queue.configure(1)
+    order: list[int] = []
+
+    request = asyncio.create_task(client.async_read_total_water())
+    await asyncio.sleep(0.02)
+    await asyncio.wait_for(_async_hold(queue, PRIORITY_INTERACTIVE, order), 0.01)
+    await request
+
+    assert order == [PRIORITY_INTERACTIVE]
+
+
+async def _async_press_latencies(
+    client: JudoConnectivityModuleApiClient,
+) -> list[float]:
+    """Press the leak protection button repeatedly, returning each latency."""
+    latencies = []
+    for _ in range(PRESSES):
+        started = time.monotonic()
+        await client.async_leak_protection_activate()
+        latencies.append(time.monotonic() - started)
+        await asyncio.sleep(DEVICE_LATENCY)
+    return latencies
+
+
+@pytest.mark.asyncio
+async def test_interactive_latency_under_background_load() -> None:
+    """Interactive p99 stays flat while a backfill and polls queue up."""
+    device = SimulatedDevice(latency=DEVICE_LATENCY)
+    client = JudoConnectivityModuleApiClient(
+        "priority.local",
+        "admin",
+        "Connectivity",
+        SimulatedSession({"priority.local": device}),  # type: ignore[arg-type]
+        # Only the device latency and the queue limit the requests
+        rate_limit=10000,
+        burst=10000,
+    )
+    idle_p99 = _p99(await _async_press_latencies(client))
+
+    first = date(2023, 1, 1)
+    backfill = asyncio.gather(
+        *(
+            client.async_read_daily_statistics(date=first + timedelta(days=day))
+            for day in range(BACKFILL_DAYS)
+        )
+    )
+
+    async def _async_poll() -> None:
+        while True:
+            client.invalidate_cache()
+            await asyncio.gather(
+                client.async_read_total_water(), client.async_read_serial_number()
+            )
+
+    polls = asyncio.create_task(_async_poll())
+    await asyncio.sleep(DEVICE_LATENCY)
+    loaded_p99 = _p99(await _async_press_latencies(client))
+    polls.cancel()
+    backfill.cancel()
+    await asyncio.gather(polls, backfill, return_exceptions=True)
+
+    # Served in order of arrival, the presses would have waited for the backfill
+    backfilled = sum(
+        count for command, count in device.requests.items() if command[:2] == "FB"
+    )
+    assert backfilled < BACKFILL_DAYS
+    assert loaded_p99 <= idle_p99 + MAX_P99_GROWTH, (idle_p99, loaded_p99)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_backfill_stops_sending() -> None:
+    """Requests of cancelled callers leave the queue instead of being sent."""
+    device = SimulatedDevice(latency=DEVICE_LATENCY)
+    client = JudoConnectivityModuleApiClient(
+        "cancel.local",
+        "admin",
+        "Connectivity",
+        SimulatedSession({"cancel.local": device}),  # type: ignore[arg-type]
+        rate_limit=10000,
+        burst=10000,
+    )
+    first = date(2023, 1, 1)
+    backfill = asyncio.gather(
+        *(
+            client.async_read_daily_statistics(date=first + timedelta(days=day))
+            for day in range(50)
+        )
+    )
+    await asyncio.sleep(DEVICE_LATENCY / 2)
+    backfill.cancel()
+    await asyncio.gather(backfill, return_exceptions=True)
+    # Sent one after the other, the whole backfill would take this long
+    await asyncio.sleep(DEVICE_LATENCY * 25)
+
+    assert sum(device.requests.values()) <= 2
+
+
+@pytest.mark.asyncio
+async def test_button_press_goes_ahead_of_backfill() -> None:
+    """A pressed button sends its command before the queued statistics."""
+    device = SimulatedDevice(latency=DEVICE_LATENCY)
+    client = JudoConnectivityModuleApiClient(
+        "button.local",
+        "admin",
+        "Connectivity",
+        SimulatedSession({"button.local": device}),  # type: ignore[arg-type]
+        rate_limit=10000,
+        burst=10000,
+    )
+    coordinator = MagicMock()
+    coordinator.config_entry.runtime_data.client = client
+    button = JudoConnectivityModuleButton(
+        coordinator,
+        ButtonEntityDescription(key="leak_protection_activate", name="Activate"),
+    )
+    first = date(2023, 1, 1)
+    backfill = asyncio.gather(
+        *(
+            client.async_read_daily_statistics(date=first + timedelta(days=day))
+            for day in range(50)
+        )
+    )
+    await asyncio.sleep(0)
+    await button.async_press()
+    backfill.cancel()
+    await asyncio.gather(backfill, return_exceptions=True)
+
+    assert device.requests["5100"] == 1
+    backfilled = sum(
+        count for command, count in device.requests.items() if command[:2] == "FB"
+    )
+    assert backfilled <= 2
@@ -0,0 +1,183 @@
+"""
+Scale tests for setting up, reloading and unloading many config entries.
+
+The number of entries defaults to 100 and can be raised (up to 1000) with the
+JUDO_SCALE_ENTRIES environment variable. Thresholds are per entry so they hold
+for any entry count; a regression in memory, requests or cleanup fails the run.
+Wall-clock thresholds depend on the machine and are only checked when the
+JUDO_SCALE_TIMING environment variable is set.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import time
+import tracemalloc
+import weakref
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+
+from .harness import EntryHarness
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
+    from homeassistant import config_entries
+
+    from .simulator import SimulatedDevice
+
+SCALE_ENTRIES = min(int(os.getenv("JUDO_SCALE_ENTRIES", "100")), 1000)
+CHECK_TIMING = bool(os.getenv("JUDO_SCALE_TIMING"))
+
+# Regression thresholds per config entry
+MAX_SETUP_SECONDS_PER_ENTRY = 0.005
+MAX_RELOAD_SECONDS_PER_ENTRY = 0.005
+# Changing only polling options must not rebuild anything
+MAX_OPTIONS_UPDATE_SECONDS_PER_ENTRY = 0.002
+MAX_MEMORY_PER_ENTRY = 32 * 1024
+# Memory still held after unloading, relative to what setup allocated, on top of
+# an allowance for interpreter and core caches that fill up independently of us
+MAX_RETAINED_MEMORY_RATIO = 0.1
+RETAINED_MEMORY_ALLOWANCE = 4 * 1024 * 1024
+
+
+def _report(record_property: Callable[[str, object], None], **values: Any) -> None:
+    """Record scale measurements as properties of the test, e.g. for JUnit XML."""
+    record_property("scale_entries", SCALE_ENTRIES)
+    for key, value in values.items():
+        record_property(f"scale_{key}", value)
+
+
+def _runtime_refs(
+    entries: Iterable[config_entries.ConfigEntry],
+) -> list[weakref.ref[Any]]:
+    """Return weak references to the runtime objects of loaded entries."""
+    return [
+        weakref.ref(obj)
+        for entry in entries
+        for obj in (entry.runtime_data.client, entry.runtime_data.coordinator)
+    ]
+
+
+def _request_count(device: SimulatedDevice) -> int:
+    """Return the number of requests a simulated device answered."""
+    return sum(device.requests.values())
+
+
+def _assert_timing(
+    setup_seconds: float, reload_seconds: float, options_seconds: float
+) -> None:
+    """Check the wall-clock thresholds if JUDO_SCALE_TIMING is set."""
+    if not CHECK_TIMING:
+        return
+    assert setup_seconds / SCALE_ENTRIES < MAX_SETUP_SECONDS_PER_ENTRY
+    assert reload_seconds / SCALE_ENTRIES < MAX_RELOAD_SECONDS_PER_ENTRY
+    assert options_seconds / SCALE_ENTRIES < MAX_OPTIONS_UPDATE_SECONDS_PER_ENTRY
+
+
+def _alive(refs: list[weakref.ref[Any]]) -> int:
+    """Return how many referenced objects survived a full collection."""
+    gc.collect()
+    return sum(ref() is not None for ref in refs)
+
+
+@pytest.mark.asyncio
+async def test_setup_reload_unload_scale(
+    tmp_path: Path, record_property: Callable[[str, object], None]
+) -> None:
+    """Test setup time, steady-state memory and unload cleanup of many entries."""
+    hass = HomeAssistant(str(tmp_path))
+    harness = EntryHarness(hass)
+    entries = [harness.create_entry(index) for index in range(SCALE_ENTRIES)]
+
+    with harness.serving():
+        await _async_run_scale_rounds(hass, harness, entries, record_property)
+
+
+async def _async_run_scale_rounds(
+    hass: HomeAssistant,
+    harness: EntryHarness,
+    entries: list[config_entries.ConfigEntry],
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Measure setup, reload and unload of all entries."""
+    try:
+        started = time.perf_counter()
+        for entry in entries:
+            await harness.async_setup(entry)
+        setup_seconds = time.perf_counter() - started
+
+        replaced_refs = _runtime_refs(entries)
+        started = time.perf_counter()
+        for entry in entries:
+            await harness.async_reload(entry)
+        reload_seconds = time.perf_counter() - started
+        leaked_on_reload = _alive(replaced_refs)
+
+        preserved = [entry.runtime_data.coordinator for entry in entries]
+        requests = sum(map(_request_count, harness.session.devices.values()))
+        started = time.perf_counter()
+        for entry in entries:
+            await harness.async_update_options(entry, {CONF_SCAN_INTERVAL: 60})
+        options_seconds = time.perf_counter() - started
+        rebuilt = sum(
+            entry.runtime_data.coordinator is not coordinator
+            for entry, coordinator in zip(entries, preserved, strict=True)
+        )
+        options_requests = (
+            sum(map(_request_count, harness.session.devices.values())) - requests
+        )
+        del preserved
+
+        for entry in entries:
+            await harness.async_unload(entry)
+
+        # Memory is measured on a second round so one-time imports do not count
+        gc.collect()
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            for entry in entries:
+                await harness.async_setup(entry)
+            gc.collect()
+            steady, _ = tracemalloc.get_traced_memory()
+
+            unloaded_refs = _runtime_refs(entries)
+            for entry in entries:
+                await harness.async_unload(entry)
+            leaked_on_unload = _alive(unloaded_refs)
+            after_unload, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        await hass.async_stop(force=True)
+
+    memory_per_entry = (steady - baseline) / SCALE_ENTRIES
+    retained = after_unload - baseline
+    retained_ratio = retained / max(steady - baseline, 1)
+    _report(
+        record_property,
+        setup_ms_per_entry=round(setup_seconds / SCALE_ENTRIES * 1000, 2),
+        reload_ms_per_entry=round(reload_seconds / SCALE_ENTRIES * 1000, 2),
+        kib_per_entry=round(memory_per_entry / 1024, 1),
+        retained_ratio=round(retained_ratio, 3),
+        options_update_ms_per_entry=round(options_seconds / SCALE_ENTRIES * 1000, 3),
+        leaked_on_reload=leaked_on_reload,
+        leaked_on_unload=leaked_on_unload,
+    )
+
+    _assert_timing(setup_seconds, reload_seconds, options_seconds)
+    assert rebuilt == 0
+    assert options_requests == 0
+    assert memory_per_entry < MAX_MEMORY_PER_ENTRY
+    assert leaked_on_reload == 0
+    assert leaked_on_unload == 0
+    assert retained < max(
+        MAX_RETAINED_MEMORY_RATIO * (steady - baseline), RETAINED_MEMORY_ALLOWANCE
+    )
+    assert all(device.requests for device in harness.session.devices.values())
@@ -0,0 +1,153 @@
+"""Tests for JUDO Connectivity Module statistics planning."""
+
+import asyncio
+from collections import Counter
+from datetime import UTC, date, datetime
+from typing import Any
+from unittest.mock import AsyncMock
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.judo_connectivity_module.statistics import (
+    RESOLUTION_3_HOURLY,
+    RESOLUTION_DAILY,
+    RESOLUTION_MONTHLY,
+    StatisticsFetcher,
+    plan_statistics_requests,
+)
+
+from .simulator import ClientFactory, SimulatedDevice
+
+TODAY = date(2024, 6, 15)
+
+
+def _operations(start: date, end: date, resolution: str) -> Counter[str]:
+    """Return how often each operation is planned for a range."""
+    return Counter(
+        request.operation
+        for request in plan_statistics_requests(start, end, resolution, TODAY)
+    )
+
+
+def test_plan_3_hourly_year() -> None:
+    """Test a year of 3-hourly history needs one request per day."""
+    assert _operations(date(2023, 1, 1), date(2023, 12, 31), RESOLUTION_3_HOURLY) == {
+        "read_daily_statistics": 365
+    }
+
+
+def test_plan_daily_current_year_uses_months() -> None:
+    """Test daily values of the current year come from whole months."""
+    plan = plan_statistics_requests(
+        date(2024, 1, 1), date(2024, 12, 31), RESOLUTION_DAILY, TODAY
+    )
+
+    assert [request.operation for request in plan] == ["read_monthly_statistics"] * 6
+    # Nothing is requested past the device date
+    assert plan[-1].last == TODAY
+
+
+def test_plan_daily_prefers_week_across_months() -> None:
+    """Test a week spanning two months is fetched with one request."""
+    assert _operations(date(2024, 1, 29), date(2024, 2, 4), RESOLUTION_DAILY) == {
+        "read_weekly_statistics": 1
+    }
+
+
+def test_plan_daily_past_year_uses_days() -> None:
+    """Test week and month commands are not used for past years."""
+    assert _operations(date(2023, 12, 1), date(2023, 12, 31), RESOLUTION_DAILY) == {
+        "read_daily_statistics": 31
+    }
+
+
+def test_plan_monthly_uses_years() -> None:
+    """Test monthly values need one request per year."""
+    assert _operations(date(2022, 3, 1), date(2024, 2, 1), RESOLUTION_MONTHLY) == {
+        "read_yearly_statistics": 3
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_skips_cached_closed_periods(
+    simulated_client: ClientFactory,
+) -> None:
+    """Test closed periods are requested once and the open one every time."""
+    device = SimulatedDevice()
+    client = simulated_client(device)
+    statistics = StatisticsFetcher(client, today=lambda: TODAY)
+
+    for _ in range(2):
+        rows = await statistics.async_fetch(date(2024, 5, 30), TODAY, RESOLUTION_DAILY)
+
+    assert len(rows) == 17
+    assert rows[0] == (datetime(2024, 5, 30, tzinfo=UTC), 10.0)
+    assert rows[-1][0] == datetime(2024, 6, 15, tzinfo=UTC)
+    # The week spanning both months is closed, the current month is not
+    assert device.requests == {"FC16": 1, "FD06": 2}
+
+
+@pytest.mark.asyncio
+async def test_fetch_respects_concurrency_limit() -> None:
+    """Test no more requests than the device allows are in flight."""
+    active = 0
+    peak = 0
+
+    async def read_daily_statistics(**_kwargs: Any) -> dict[str, Any]:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+        return {"data": "", "decoded": [1.0] * 8}
+
+    client = AsyncMock()
+    client.async_read_daily_statistics.side_effect = read_daily_statistics
+    statistics = StatisticsFetcher(client, 2, today=lambda: TODAY)
+
+    rows = await statistics.async_fetch(
+        date(2023, 1, 1), date(2023, 1, 10), RESOLUTION_3_HOURLY
+    )
+
+    assert len(rows) == 80
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_periods_of_another_year_are_not_reused(
+    simulated_client: ClientFactory,
+) -> None:
+    """Test a month number cached last year is requested again this year."""
+    device = SimulatedDevice()
+    client = simulated_client(device)
+    today = date(2026, 2, 10)
+    statistics = StatisticsFetcher(client, today=lambda: today)
+    await statistics.async_fetch(date(2026, 1, 1), date(2026, 1, 31), RESOLUTION_DAILY)
+
+    today = date(2027, 1, 20)
+    device.prefix_responses["FD"] = "E8030000" * 31
+    rows = await statistics.async_fetch(
+        date(2027, 1, 1), date(2027, 1, 5), RESOLUTION_DAILY
+    )
+
+    assert device.requests["FD01"] == 2
+    assert rows[0] == (datetime(2027, 1, 1, tzinfo=UTC), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_rows_carry_the_device_time_zone(
+    simulated_client: ClientFactory,
+) -> None:
+    """Test the device's wall-clock intervals are not taken for UTC."""
+    berlin = ZoneInfo("Europe/Berlin")
+    statistics = StatisticsFetcher(
+        simulated_client(), today=lambda: TODAY, time_zone=berlin
+    )
+
+    rows = await statistics.async_fetch(
+        date(2024, 6, 1), date(2024, 6, 1), RESOLUTION_3_HOURLY
+    )
+
+    assert rows[0][0] == datetime(2024, 5, 31, 22, tzinfo=UTC)
+    assert rows[1][0] == datetime(2024, 6, 1, 3, tzinfo=berlin)
@@ -0,0 +1,188 @@
+"""Tests for typed device errors and the negative capability cache."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.judo_connectivity_module import (
+    _async_restore_unsupported,
+)
+from custom_components.judo_connectivity_module.api import (
+    JudoConnectivityModuleApiClientDeviceError,
+    JudoConnectivityModuleApiClientUnsupportedError,
+    parse_device_error,
+)
+from custom_components.judo_connectivity_module.coordinator import (
+    JudoConnectivityModuleDataUpdateCoordinator,
+)
+from custom_components.judo_connectivity_module.poll_plan import (
+    DEVICES,
+)
+
+from .simulator import (
+    HTTP_BAD_REQUEST,
+    HTTP_NOT_FOUND,
+    ClientFactory,
+    SimulatedDevice,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CAPABILITIES = [
+    "get_device_type",
+    "read_serial_number",
+    "read_total_water",
+    "read_software_version",
+]
+
+
+@pytest.mark.parametrize(
+    ("data", "code"),
+    [
+        ("FF0001", 1),
+        ("ff0005", 5),
+        # Undocumented code, other lengths and other prefixes are data
+        ("FF0009", None),
+        ("FF000100", None),
+        ("661301", None),
+        ("", None),
+    ],
+)
+def test_parse_device_error(data: str, code: int | None) -> None:
+    """Only responses shaped like documented device control errors are errors."""
+    assert parse_device_error(data) == code
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_not_requested_again(
+    simulated_client: ClientFactory,
+) -> None:
+    """A command answered with 404 fails without a request from then on."""
+    device = SimulatedDevice()
+    del device.responses["0600"]
+    client = simulated_client(device)
+
+    with pytest.raises(JudoConnectivityModuleApiClientUnsupportedError) as error:
+        await client.async_read_serial_number()
+    with pytest.raises(JudoConnectivityModuleApiClientUnsupportedError):
+        await client.async_read_serial_number()
+
+    assert error.value.status == HTTP_NOT_FOUND
+    assert device.requests["0600"] == 1
+    assert "read_serial_number" in client.unsupported
+
+
+@pytest.mark.asyncio
+async def test_firmware_change_clears_unsupported(
+    simulated_client: ClientFactory,
+) -> None:
+    """Rejected operations are requested again once the firmware changes."""
+    device = SimulatedDevice()
+    device.rejected["0600"] = HTTP_BAD_REQUEST
+    client = simulated_client(device)
+    await client.async_read_software_version()
+    with pytest.raises(JudoConnectivityModuleApiClientUnsupportedError):
+        await client.async_read_serial_number()
+
+    # Same firmware, the operation stays unsupported
+    client.invalidate_cache()
+    await client.async_read_software_version()
+    assert "read_serial_number" in client.unsupported
+
+    device.responses["0100"] = "661401"
+    del device.rejected["0600"]
+    client.invalidate_cache()
+    await client.async_read_software_version()
+    result = await client.async_read_serial_number()
+
+    assert result["data"] == "0774ed0b"
+    assert client.unsupported.firmware == "1.20f"
+    assert not client.unsupported
+
+
+@pytest.mark.asyncio
+async def test_bad_arguments_are_not_cached(simulated_client: ClientFactory) -> None:
+    """A 400 for a command with arguments may be about the arguments."""
+    device = SimulatedDevice()
+    device.rejected["FB"] = HTTP_BAD_REQUEST
+    client = simulated_client(device)
+
+    for _ in range(2):
+        with pytest.raises(JudoConnectivityModuleApiClientUnsupportedError):
+            await client.async_read_daily_statistics(date=date(2023, 8, 13))
+
+    assert device.requests["FB0D0817"] == 2
+    assert not client.unsupported
+
+
+@pytest.mark.asyncio
+async def test_device_error_is_transient(simulated_client: ClientFactory) -> None:
+    """Device control errors are typed, neither decoded nor cached."""
+    device = SimulatedDevice(responses={"2800": "FF0001"})
+    client = simulated_client(device)
+
+    with pytest.raises(JudoConnectivityModuleApiClientDeviceError) as error:
+        await client.async_read_total_water()
+    device.responses["2800"] = "40420F00"
+    result = await client.async_read_total_water()
+
+    assert error.value.code == 1
+    assert "checksum" in str(error.value)
+    assert result["decoded"] == 1000.0
+    assert not client.unsupported
+
+
+@pytest.mark.asyncio
+async def test_coordinator_stops_polling_unsupported(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """Unsupported operations are dropped from polls instead of failing them."""
+    hass = HomeAssistant(str(tmp_path))
+    device = SimulatedDevice()
+    device.rejected["0600"] = HTTP_NOT_FOUND
+    coordinator = JudoConnectivityModuleDataUpdateCoordinator(
+        hass, simulated_client(device)
+    )
+
+    with patch.dict(DEVICES, {"68": {"name": "Mixed", "capabilities": CAPABILITIES}}):
+        await coordinator.async_refresh()
+        coordinator._client.invalidate_cache()  # noqa: SLF001
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert not coordinator.failed_operations
+    assert "read_serial_number" not in coordinator.data
+    assert "read_total_water" in coordinator.data
+    assert device.requests["0600"] == 1
+    await hass.async_stop(force=True)
+
+
+@pytest.mark.asyncio
+async def test_unsupported_survive_restart(
+    tmp_path: Path, simulated_client: ClientFactory
+) -> None:
+    """The operations a device rejected are restored after a restart."""
+    entry = MagicMock(entry_id="mixed")
+    hass = HomeAssistant(str(tmp_path))
+    client = simulated_client(SimulatedDevice())
+    await _async_restore_unsupported(hass, entry, client)
+    client.unsupported.set_firmware("1.19f")
+    client.unsupported.add("read_serial_number", HTTP_NOT_FOUND)
+    # Pending saves are written when Home Assistant stops
+    await hass.async_stop(force=True)
+
+    hass = HomeAssistant(str(tmp_path))
+    client = simulated_client(SimulatedDevice())
+    await _async_restore_unsupported(hass, entry, client)
+
+    assert client.unsupported.as_dict() == {
+        "firmware": "1.19f",
+        "operations": {"read_serial_number": HTTP_NOT_FOUND},
+    }
+    await hass.async_stop(force=True)
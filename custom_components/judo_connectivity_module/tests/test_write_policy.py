@@ -0,0 +1,121 @@
+"""Tests for state write throttling."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.components.sensor import SensorEntityDescription
+from homeassistant.core import HomeAssistant
+
+from custom_components.judo_connectivity_module import sensor
+from custom_components.judo_connectivity_module.helpers import load_entity_configs
+from custom_components.judo_connectivity_module.sensor import (
+    JudoConnectivityModuleSensor,
+)
+from custom_components.judo_connectivity_module.write_policy import WritePolicy
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.parametrize(
+    ("value", "written", "elapsed", "expected"),
+    [
+        (1000.0, None, None, True),
+        (1000.005, 1000.0, 120, False),
+        (1000.01, 1000.0, 120, True),
+        (1000.02, 1000.0, 30, False),
+        (1000.0, 1000.0, 1800, True),
+        ("1.19f", "1.19e", 120, True),
+        ("1.19f", "1.19f", 120, False),
+    ],
+)
+def test_should_write(
+    value: object, written: object, elapsed: float | None, *, expected: bool
+) -> None:
+    """Test deadband, minimum interval and heartbeat."""
+    policy = WritePolicy(deadband=0.01, min_interval=60, max_interval=1800)
+    assert policy.should_write(value, written, elapsed) is expected
+
+
+def test_relative_deadband() -> None:
+    """Test the deadband may scale with the written value."""
+    policy = WritePolicy(relative_deadband=0.01)
+    assert not policy.should_write(100.5, 100.0, 1)
+    assert policy.should_write(101.0, 100.0, 1)
+
+
+def test_policy_from_config() -> None:
+    """Test policies are read from the entity configuration."""
+    config = load_entity_configs()["read_total_water"]["write_policy"]
+    assert WritePolicy.from_config(config) == WritePolicy(
+        deadband=0.01, min_interval=60, max_interval=1800
+    )
+    assert WritePolicy.from_config(None) is None
+    with pytest.raises(ValueError, match="interval"):
+        WritePolicy.from_config({"interval": 5})
+
+
+def test_sensor_skips_writes_inside_the_deadband() -> None:
+    """Test coordinator updates only write states the policy lets through."""
+    coordinator = MagicMock(data={}, last_update_success=True)
+    entity = JudoConnectivityModuleSensor(
+        coordinator,
+        SensorEntityDescription(key="read_total_water"),
+        WritePolicy(deadband=0.01, max_interval=1800),
+    )
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    with patch.object(sensor.time, "monotonic") as monotonic:
+        for now, value in [
+            (0, 1000.0),
+            (60, 1000.004),
+            (120, 1000.011),
+            (1980, 1000.012),
+        ]:
+            monotonic.return_value = now
+            coordinator.data = {"read_total_water": {"decoded": value}}
+            entity._handle_coordinator_update()  # noqa: SLF001
+        # Becoming unavailable is always written
+        coordinator.last_update_success = False
+        entity._handle_coordinator_update()  # noqa: SLF001
+
+    assert writes == [1000.0, 1000.011, 1000.012, 1000.012]
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_does_not_wait_for_polls(tmp_path: Path) -> None:
+    """Test an unchanged state is written again without a coordinator update."""
+    coordinator = MagicMock(
+        data={"read_total_water": {"decoded": 1000.0}}, last_update_success=True
+    )
+    entity = JudoConnectivityModuleSensor(
+        coordinator,
+        SensorEntityDescription(key="read_total_water"),
+        WritePolicy(deadband=0.01, max_interval=1800),
+    )
+    entity.hass = HomeAssistant(str(tmp_path))
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    with (
+        patch.object(sensor, "async_track_time_interval") as track,
+        patch.object(sensor.time, "monotonic") as monotonic,
+    ):
+        await entity.async_added_to_hass()
+        _hass, heartbeat, interval = track.call_args.args
+        assert interval == timedelta(seconds=1800)
+
+        monotonic.return_value = 0
+        entity._handle_coordinator_update()  # noqa: SLF001
+        monotonic.return_value = 1000
+        heartbeat(None)
+        monotonic.return_value = 1800
+        heartbeat(None)
+
+    assert writes == [1000.0, 1000.0]
+    await entity.hass.async_stop(force=True)
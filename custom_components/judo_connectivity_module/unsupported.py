@@ -0,0 +1,84 @@
+"""Negative capability cache for judo_connectivity_module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping
+
+
+class UnsupportedOperations:
+    """
+    Operations a device rejected as unsupported, kept until its firmware changes.
+
+    Operations rejected before the firmware version is known are attributed to
+    the first version read. The listener is called after every change, so the
+    owner can persist ``as_dict()``.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.firmware: str | None = None
+        # HTTP status each operation was rejected with, by operation name
+        self._operations: dict[str, int] = {}
+        self.listener: Callable[[], None] | None = None
+
+    def __contains__(self, operation: object) -> bool:
+        """Return whether an operation is known to be unsupported."""
+        return operation in self._operations
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the unsupported operations."""
+        return iter(self._operations)
+
+    def __len__(self) -> int:
+        """Return the number of unsupported operations."""
+        return len(self._operations)
+
+    def status(self, operation: str) -> int | None:
+        """Return the HTTP status an operation was rejected with."""
+        return self._operations.get(operation)
+
+    def add(self, operation: str, status: int) -> None:
+        """Record an operation the device rejected."""
+        if self._operations.get(operation) == status:
+            return
+        self._operations[operation] = status
+        self._changed()
+
+    def set_firmware(self, firmware: str) -> None:
+        """Record the firmware version, forgetting all operations if it changed."""
+        if firmware == self.firmware:
+            return
+        if self.firmware is not None:
+            # New firmware may support what the old one rejected
+            self._operations.clear()
+        self.firmware = firmware
+        self._changed()
+
+    def clear(self) -> None:
+        """Forget the firmware version and all operations."""
+        if self.firmware is None and not self._operations:
+            return
+        self.firmware = None
+        self._operations.clear()
+        self._changed()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache in a JSON serializable form."""
+        return {"firmware": self.firmware, "operations": dict(self._operations)}
+
+    def load(self, data: Mapping[str, Any] | None) -> None:
+        """Restore the cache from ``as_dict()`` output, without notifying."""
+        data = data or {}
+        self.firmware = data.get("firmware")
+        self._operations = {
+            str(operation): int(status)
+            for operation, status in (data.get("operations") or {}).items()
+        }
+
+    def _changed(self) -> None:
+        """Notify the listener of a change."""
+        if self.listener is not None:
+            self.listener()
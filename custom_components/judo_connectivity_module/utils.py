@@ -1,50 +1,57 @@
 """Utility functions for JUDO Connectivity Module."""
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from pathlib import Path
 
 import yaml
 
 
-# Decoding functions for response patterns
-def decode_hex_value(value: str) -> int:
-    """Decode a hex string to an integer."""
-    return int.from_bytes(bytes.fromhex(value), byteorder="little")
+# Decoding functions for response patterns, given the hex string or its bytes
+def _raw(value: str | bytes | memoryview) -> bytes | memoryview:
+    """Return the bytes of a payload."""
+    return bytes.fromhex(value) if isinstance(value, str) else value
 
 
-def decode_water_volume(value: str) -> float:
-    """Decode a hex string to a water volume in cubic meters."""
-    liters = int.from_bytes(bytes.fromhex(value), byteorder="little")
+def decode_hex_value(value: str | bytes | memoryview) -> int:
+    """Decode a payload to an integer."""
+    return int.from_bytes(_raw(value), byteorder="little")
+
+
+def decode_water_volume(value: str | bytes | memoryview) -> float:
+    """Decode a payload to a water volume in cubic meters."""
+    liters = int.from_bytes(_raw(value), byteorder="little")
     return round(liters / 1000, 3)  # Convert to m³ with 3 decimal places
 
 
-def decode_timestamp(value: str) -> datetime:
-    """Decode a hex string to a UNIX timestamp in UTC."""
-    timestamp = int.from_bytes(bytes.fromhex(value), byteorder="big")
+def decode_water_volume_series(value: str | bytes | memoryview) -> list[float]:
+    """Decode consecutive 4-byte volumes to a list of m³ values."""
+    raw = memoryview(_raw(value))
+    return [
+        round(int.from_bytes(raw[i : i + 4], byteorder="little") / 1000, 3)
+        for i in range(0, len(raw) - len(raw) % 4, 4)
+    ]
+
+
+def decode_timestamp(value: str | bytes | memoryview) -> datetime:
+    """Decode a payload to a UNIX timestamp in UTC."""
+    timestamp = int.from_bytes(_raw(value), byteorder="big")
     return datetime.fromtimestamp(
         timestamp,
         tz=UTC,
     )
 
 
-def decode_version(value: str) -> str:
-    """Decode a hex string to a version string."""
-    letter = chr(int(value[0:2], 16))
-    minor = int(value[2:4], 16)
-    major = int(value[4:6], 16)
-    return f"{major}.{minor}{letter}"
+def decode_version(value: str | bytes | memoryview) -> str:
+    """Decode a payload to a version string."""
+    letter, minor, major = _raw(value)[:3]
+    return f"{major}.{minor}{chr(letter)}"
 
 
-def decode_datetime_bytes(value: str) -> datetime:
-    """Decode a hex string to a datetime object in UTC."""
-    day = int(value[0:2], 16)
-    month = int(value[2:4], 16)
-    year = int(value[4:6], 16) + 2000  # Assuming years are 20xx
-    hour = int(value[6:8], 16)
-    minute = int(value[8:10], 16)
-    second = int(value[10:12], 16)
+def decode_datetime_bytes(value: str | bytes | memoryview) -> datetime:
+    """Decode a payload to a datetime object in UTC."""
+    day, month, year, hour, minute, second = _raw(value)[:6]
     return datetime(
-        year,
+        year + 2000,  # Assuming years are 20xx
         month,
         day,
         hour,
@@ -54,8 +61,8 @@ def decode_datetime_bytes(value: str) -> datetime:
     )
 
 
-def decode_serial_number(value: str) -> str:
-    """Decode a hex string to a decimal serial number."""
+def decode_serial_number(value: str | bytes | memoryview) -> str:
+    """Decode a payload to a decimal serial number."""
     return str(decode_hex_value(value)) if value else ""
 
 
@@ -69,9 +76,17 @@ def get_device_name(device_type: str) -> str:
 
 
 # Encoding functions for parameter patterns
-def encode_hex_date(date: datetime) -> str:
-    """Encode a datetime object to a hex string representing a date."""
-    return f"{date.day:02X}{date.month:02X}{date.year:04X}"
+def encode_hex_date(day: date) -> str:
+    """Encode a date to a hex string DDMMYY."""
+    return f"{day.day:02X}{day.month:02X}{day.year % 100:02X}"
+
+
+def encode_datetime_bytes(value: datetime) -> str:
+    """Encode a datetime object to the 6-byte device date and time format."""
+    return (
+        f"{value.day:02X}{value.month:02X}{value.year - 2000:02X}"
+        f"{value.hour:02X}{value.minute:02X}{value.second:02X}"
+    )
 
 
 def encode_hex_week(week: int) -> str:
@@ -85,5 +100,5 @@ def encode_hex_month(month: int) -> str:
 
 
 def encode_hex_year(year: int) -> str:
-    """Encode a year to a hex string."""
-    return f"{year:04X}"
+    """Encode the last two digits of a year to a hex string."""
+    return f"{year % 100:02X}"
@@ -0,0 +1,93 @@
+"""Websocket API for judo_connectivity_module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN
+from .coordinator import OPERATION_ERRORS
+from .export import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMATS,
+    MAX_CHUNK_SIZE,
+    async_iter_export_chunks,
+)
+from .services import async_get_loaded_entry
+from .statistics import RESOLUTION_3_HOURLY, RESOLUTIONS
+
+if TYPE_CHECKING:
+    from .statistics import StatisticsFetcher
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the websocket commands of this integration."""
+    websocket_api.async_register_command(hass, ws_export_history)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/export_history",
+        vol.Required("config_entry_id"): str,
+        vol.Required("start"): cv.date,
+        vol.Required("end"): cv.date,
+        vol.Optional("format", default=EXPORT_FORMAT_CSV): vol.In(EXPORT_FORMATS),
+        vol.Optional("chunk_size", default=DEFAULT_CHUNK_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_CHUNK_SIZE)
+        ),
+        vol.Optional("resolution", default=RESOLUTION_3_HOURLY): vol.In(RESOLUTIONS),
+    }
+)
+@callback
+def ws_export_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream the consumption history of a device as a subscription."""
+    try:
+        entry = async_get_loaded_entry(hass, msg["config_entry_id"])
+    except ServiceValidationError as exception:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(exception))
+        return
+
+    task = hass.async_create_background_task(
+        _async_stream_export(connection, msg, entry.runtime_data.statistics),
+        f"{DOMAIN} export {msg['config_entry_id']}",
+    )
+    # Closing the subscription or the connection cancels the export
+    connection.subscriptions[msg["id"]] = task.cancel
+    connection.send_result(msg["id"])
+
+
+async def _async_stream_export(
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+    statistics: StatisticsFetcher,
+) -> None:
+    """Send each export chunk as a subscription event."""
+    try:
+        async for chunk in async_iter_export_chunks(
+            statistics,
+            msg["start"],
+            msg["end"],
+            msg["format"],
+            msg["chunk_size"],
+            msg["resolution"],
+        ):
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"chunk": chunk})
+            )
+    except OPERATION_ERRORS as exception:
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"error": str(exception)})
+        )
+        return
+    connection.send_message(websocket_api.event_message(msg["id"], {"done": True}))
@@ -0,0 +1,52 @@
+"""State write throttling for judo_connectivity_module."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+@dataclass(frozen=True)
+class WritePolicy:
+    """When a new value of an entity is worth a state write."""
+
+    # Smallest change written, in the unit of the entity
+    deadband: float = 0.0
+    # Smallest change written, as a fraction of the last written value
+    relative_deadband: float = 0.0
+    # Seconds a written state is kept at least
+    min_interval: float = 0.0
+    # Seconds after which the state is written even if unchanged (heartbeat).
+    # Sensors check it on every poll and every max_interval, so without a poll
+    # in between the state may be up to twice as old.
+    max_interval: float | None = None
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any] | None) -> WritePolicy | None:
+        """Create a policy from the write_policy section of an entity."""
+        if not config:
+            return None
+        names = {field.name for field in fields(cls)}
+        if unknown := config.keys() - names:
+            error_message = f"Unknown write policy settings: {sorted(unknown)}"
+            raise ValueError(error_message)
+        return cls(**config)
+
+    def should_write(self, value: Any, written: Any, elapsed: float | None) -> bool:
+        """Return whether to write a value, given the last written one and its age."""
+        if elapsed is None:
+            return True
+        if self.max_interval is not None and elapsed >= self.max_interval:
+            return True
+        if elapsed < self.min_interval or value == written:
+            return False
+        if not isinstance(value, int | float) or not isinstance(written, int | float):
+            return True
+        threshold = max(self.deadband, self.relative_deadband * abs(written))
+        change = abs(value - written)
+        # Decimal values such as liters in m³ are not exact in binary
+        return change >= threshold or math.isclose(change, threshold)